@@ -9,10 +9,28 @@ da aplicação (caminhos, credenciais, sistemas ativos).
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
 
+# Sistemas do pipeline (chave, nome de exibição), na ordem da interface.
+# Fonte única para os defaults do config e para os checkboxes da MainWindow.
+SYSTEMS: Tuple[Tuple[str, str], ...] = (
+    ("amplis", "Amplis"),
+    ("maps", "MAPS"),
+    ("fidc_estoque", "FIDC Estoque"),
+    ("jcot", "JCOT"),
+    ("britech", "Britech"),
+    ("qore_pdf", "QORE PDF"),
+    ("qore_excel", "QORE Excel"),
+    ("qore_xml", "QORE XML"),
+    ("xml_upload", "XML Upload"),
+)
+
+# Sistemas habilitados por padrão em uma configuração nova
+DEFAULT_ENABLED_SYSTEMS = frozenset({"qore_xml", "xml_upload"})
+
+
 @dataclass
 class SystemConfig:
     """Configuração de um sistema individual."""
@@ -48,6 +66,7 @@ class ConfigManager:
         """
         self.config_path = config_path or self.DEFAULT_CONFIG_PATH
         self._config: Dict[str, Any] = {}
+        self._enabled_systems: Set[str] = set()
         self.load()
     
     def load(self) -> bool:
@@ -61,16 +80,27 @@ class ConfigManager:
             if self.config_path.exists():
                 with open(self.config_path, 'r', encoding='utf-8') as f:
                     self._config = json.load(f)
+                self._refresh_enabled_systems()
                 return True
             else:
                 self._config = self._get_default_config()
+                self._refresh_enabled_systems()
                 self.save()
                 return True
         except Exception as e:
             print(f"Erro ao carregar config: {e}")
             self._config = self._get_default_config()
+            self._refresh_enabled_systems()
             return False
     
+    def _refresh_enabled_systems(self) -> None:
+        """Recalcula o conjunto de sistemas habilitados a partir do config bruto."""
+        systems = self._config.get("systems", {})
+        self._enabled_systems = {
+            key for key, val in systems.items()
+            if isinstance(val, dict) and val.get("enabled", False)
+        }
+    
     def save(self) -> bool:
         """
         Salva configurações no arquivo JSON.
@@ -105,15 +135,8 @@ class ConfigManager:
                 "temp_downloads": ""
             },
             "systems": {
-                "amplis": {"enabled": False, "name": "Amplis"},
-                "maps": {"enabled": False, "name": "MAPS"},
-                "fidc_estoque": {"enabled": False, "name": "FIDC Estoque"},
-                "jcot": {"enabled": False, "name": "JCOT"},
-                "britech": {"enabled": False, "name": "Britech"},
-                "qore_pdf": {"enabled": False, "name": "QORE PDF"},
-                "qore_excel": {"enabled": False, "name": "QORE Excel"},
-                "qore_xml": {"enabled": True, "name": "QORE XML"},
-                "xml_upload": {"enabled": True, "name": "XML Upload"}
+                key: {"enabled": key in DEFAULT_ENABLED_SYSTEMS, "name": name}
+                for key, name in SYSTEMS
             },
             "credentials": {}
         }
@@ -162,10 +185,18 @@ class ConfigManager:
                 target[k] = {}
             target = target[k]
         target[keys[-1]] = value
+        
+        if keys[0] == "systems":
+            self._refresh_enabled_systems()
     
     def set_system_enabled(self, key: str, enabled: bool) -> None:
         """Define se um sistema está habilitado."""
-        self.set(f"systems.{key}.enabled", enabled)
+        system = self._config.setdefault("systems", {}).setdefault(key, {})
+        system["enabled"] = enabled
+        if enabled:
+            self._enabled_systems.add(key)
+        else:
+            self._enabled_systems.discard(key)
     
     def set_credential(self, system: str, field: str, value: str) -> None:
         """Define uma credencial específica."""
@@ -176,9 +207,8 @@ class ConfigManager:
     # =========================================================================
     
     def get_enabled_systems(self) -> list:
-        """Retorna lista de sistemas habilitados."""
-        systems = self.get("systems", {})
-        return [key for key, val in systems.items() if val.get("enabled", False)]
+        """Retorna lista de sistemas habilitados (na ordem do config)."""
+        return [key for key in self._config.get("systems", {}) if key in self._enabled_systems]
     
     def set_all_systems(self, enabled: bool) -> None:
         """Habilita ou desabilita todos os sistemas."""
@@ -187,5 +217,14 @@ class ConfigManager:
             self.set_system_enabled(key, enabled)
 
 
-# Instância global (opcional)
-config = ConfigManager()
+# Instância global (opcional) - criada sob demanda no primeiro acesso,
+# evitando I/O de disco e parse de JSON em todo import do módulo
+_config_instance: Optional[ConfigManager] = None
+
+
+def get_config() -> ConfigManager:
+    """Retorna a instância global do ConfigManager, criando-a no primeiro uso."""
+    global _config_instance
+    if _config_instance is None:
+        _config_instance = ConfigManager()
+    return _config_instance
@@ -11,10 +11,13 @@ Interface principal com:
 """
 
 import customtkinter as ctk
+from collections import deque
 from datetime import datetime, date
-from typing import Callable, Optional
+from typing import Any, Callable, Deque, Optional, Tuple
 import threading
 
+from core.config import SYSTEMS
+
 
 class MainWindow(ctk.CTk):
     """
@@ -33,6 +36,11 @@ class MainWindow(ctk.CTk):
         self.is_running = False
         self.system_vars = {}
         
+        # Fila de atualizações vindas da thread de execução, drenada na
+        # thread da UI pelo evento virtual <<PipelineUpdate>>
+        self._pending_events: Deque[Tuple[str, Any]] = deque()
+        self.bind("<<PipelineUpdate>>", self._drain_pending_events)
+        
         # Configura grid principal
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(3, weight=1)  # Log expande
@@ -113,21 +121,8 @@ class MainWindow(ctk.CTk):
         )
         title.grid(row=0, column=0, columnspan=4, sticky="w", padx=15, pady=(10, 5))
         
-        # Lista de sistemas
-        systems = [
-            ("amplis", "Amplis"),
-            ("maps", "MAPS"),
-            ("fidc_estoque", "FIDC Estoque"),
-            ("jcot", "JCOT"),
-            ("britech", "Britech"),
-            ("qore_pdf", "QORE PDF"),
-            ("qore_excel", "QORE Excel"),
-            ("qore_xml", "QORE XML"),
-            ("xml_upload", "XML Upload"),
-        ]
-        
         # Cria checkboxes em grid 3 colunas
-        for i, (key, name) in enumerate(systems):
+        for i, (key, name) in enumerate(SYSTEMS):
             row = (i // 3) + 1
             col = i % 3
             
@@ -294,6 +289,25 @@ class MainWindow(ctk.CTk):
         """Retorna lista de sistemas selecionados."""
         return [key for key, var in self.system_vars.items() if var.get()]
     
+    def _post_events(self, *events: Tuple[str, Any]):
+        """
+        Enfileira atualizações de UI a partir de uma thread de trabalho.
+        Um único evento virtual é gerado por lote; o handler drena a fila toda.
+        """
+        self._pending_events.extend(events)
+        self.event_generate("<<PipelineUpdate>>", when="tail")
+    
+    def _drain_pending_events(self, event=None):
+        """Aplica na thread da UI todas as atualizações pendentes."""
+        while self._pending_events:
+            kind, value = self._pending_events.popleft()
+            if kind == "log":
+                self._log(value)
+            elif kind == "progress":
+                self._update_progress(value)
+            elif kind == "finished":
+                self._execution_finished()
+    
     # =========================================================================
     # EVENT HANDLERS
     # =========================================================================
@@ -341,14 +355,15 @@ class MainWindow(ctk.CTk):
                 if not self.is_running:
                     break
                     
-                self.after(0, lambda s=sys: self._log(f"➡️ Executando {s}..."))
+                self._post_events(("log", f"➡️ Executando {sys}..."))
                 time.sleep(1)  # Simula trabalho
                 
-                progress = (i + 1) / total
-                self.after(0, lambda p=progress: self._update_progress(p))
-                self.after(0, lambda s=sys: self._log(f"✅ {s} concluído!"))
+                self._post_events(
+                    ("progress", (i + 1) / total),
+                    ("log", f"✅ {sys} concluído!"),
+                )
             
-            self.after(0, self._execution_finished)
+            self._post_events(("finished", None))
         
         thread = threading.Thread(target=run, daemon=True)
         thread.start()
@@ -24,20 +24,27 @@ Data: Dezembro 2025
 
 import os
 import re
+import random
 import sys
 import time
 import shutil
+import tempfile
+import json
+import multiprocessing
+import queue
+import functools
 import logging
 import zipfile
+import zlib
 from pathlib import Path
 from datetime import datetime
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import threading
 
-import pandas as pd
 import openpyxl
+from openpyxl.utils import get_column_letter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -47,9 +54,39 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
-    StaleElementReferenceException
+    StaleElementReferenceException,
+    ElementClickInterceptedException,
+    ElementNotInteractableException
 )
 
+# inotify (opcional, apenas Linux): eventos do kernel na pasta de download.
+# Sem ele os workers tentam o watchdog e, por fim, polling com backoff.
+try:
+    import inotify_simple
+except ImportError:
+    inotify_simple = None
+
+# watchdog (opcional): eventos da pasta fora do Linux (ReadDirectoryChangesW
+# no Windows, FSEvents no macOS)
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
+# psutil (opcional): encerrar a arvore de processos do Chrome travado
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# python-calamine (opcional): parser XLSX em Rust para o BD.xlsx.
+# Sem ele a leitura usa openpyxl em streaming (read_only).
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 
 # =============================================================================
 # CONFIGURACAO DE LOGGING
@@ -112,7 +149,8 @@ class Timeouts:
     ELEMENT_CLICK: int = 6
     ELEMENT_PRESENT: int = 4
     DOWNLOAD_WAIT: int = 45
-    DOWNLOAD_CHECK_INTERVAL: float = 0.3
+    DOWNLOAD_POLL_MIN: float = 0.05   # Polling adaptativo: intervalo inicial
+    DOWNLOAD_POLL_MAX: float = 1.0    # ... e teto do backoff
     POST_CLICK_WAIT: int = 1
     POST_NAVIGATION_WAIT: int = 1
     MAX_RETRIES: int = 2  # Tentativas em caso de falha
@@ -144,6 +182,9 @@ BLOKO_PATTERNS: Dict[str, str] = {
     'BLOKO FIM': 'fundo-de-investimento'
 }
 
+# Valores da coluna J do BD.xlsx que marcam o fundo como QORE
+FLAGS_QORE = frozenset({'SIM', 'S', 'TRUE', 'YES', 'VERDADEIRO', 'QORE'})
+
 # Meses por extenso
 MESES_EXTENSO: Dict[str, str] = {
     '01': 'Janeiro', '02': 'Fevereiro', '03': 'Marco', '04': 'Abril',
@@ -186,6 +227,7 @@ class QoreFlags:
     excel_lote: bool = False
     xml_enabled: bool = False
     xml_lote: bool = False
+    use_api: bool = False  # C31: tipos com endpoint HTTP vao pela API
 
 
 @dataclass
@@ -209,36 +251,124 @@ class QoreDatas:
 # FUNCOES UTILITARIAS
 # =============================================================================
 
+def _texto_celula(valor) -> str:
+    """Normaliza valor de celula para texto sem espacos ('' se vazia)."""
+    if valor is None:
+        return ''
+    if isinstance(valor, str):
+        return valor.strip()
+    return str(valor).strip()
+
+
 def validar_boolean(valor) -> bool:
     """Converte valores da planilha para booleano."""
-    if pd.isna(valor) or valor is None:
+    # Celulas do openpyxl: vazia = None; NaN so em float (valor != valor)
+    if valor is None or (isinstance(valor, float) and valor != valor):
         return False
     valor_str = str(valor).strip().upper()
     return valor_str in {'SIM', 'S', 'TRUE', 'VERDADEIRO', 'YES', 'Y', '1'}
 
 
+# Data YYYYMMDD no nome do arquivo: grupo 1 = precedida de underscore
+# (mais seguro, evita CNPJ), grupo 2 = qualquer sequencia de 8 digitos
+_RE_DATA_ARQUIVO = re.compile(r'_(\d{8})|(\d{8})')
+
+# Menu de opcoes (...) da tela de relatorios
+XPATH_MENU_ELLIPSIS = '//div[@data-kt-menu-trigger="click" and .//i[contains(@class, "ellipsis")]]'
+
+
+def _converter_data_arquivo(date_str: str) -> Optional[datetime]:
+    """Converte YYYYMMDD em datetime, validando ano razoavel (evita CNPJ)."""
+    try:
+        dt = datetime.strptime(date_str, '%Y%m%d')
+    except ValueError:
+        return None
+    return dt if 2000 <= dt.year <= 2035 else None
+
+
 def extrair_data_de_nome_arquivo(nome_arquivo: str) -> Optional[datetime]:
     """
     Extrai data do nome do arquivo (formato YYYYMMDD).
     Usa regex com underscore para evitar confundir com CNPJ.
+    Varre o nome uma unica vez: datas com underscore tem prioridade e
+    retornam na primeira valida; sequencias sem underscore so sao usadas
+    como fallback quando nao ha nenhuma com underscore.
     """
-    # Primeiro tenta com underscore (mais seguro)
-    matches = re.findall(r'_(\d{8})', nome_arquivo)
+    tem_underscore = False
+    fallback = None
+
+    for m in _RE_DATA_ARQUIVO.finditer(nome_arquivo):
+        com_underscore = m.group(1)
+        if com_underscore is not None:
+            tem_underscore = True
+            dt = _converter_data_arquivo(com_underscore)
+            if dt:
+                return dt
+        elif fallback is None and not tem_underscore:
+            fallback = _converter_data_arquivo(m.group(2))
 
-    # Fallback: qualquer sequencia de 8 digitos
-    if not matches:
-        matches = re.findall(r'(\d{8})', nome_arquivo)
+    return None if tem_underscore else fallback
 
-    for date_str in matches:
-        try:
-            dt = datetime.strptime(date_str, '%Y%m%d')
-            # Valida ano razoavel (evita CNPJ)
-            if 2000 <= dt.year <= 2035:
-                return dt
-        except ValueError:
-            continue
 
-    return None
+def _ler_celulas(ws, min_row: int, max_row: int, min_col: int, max_col: int) -> Dict[str, Any]:
+    """
+    Le uma janela retangular da planilha em uma unica passada.
+    Retorna {coordenada: valor} (ex: {'C4': ...}), adequado para worksheets
+    read_only, que nao suportam acesso aleatorio eficiente por celula.
+    """
+    valores: Dict[str, Any] = {}
+    for num_linha, linha in enumerate(
+        ws.iter_rows(min_row=min_row, max_row=max_row,
+                     min_col=min_col, max_col=max_col, values_only=True),
+        start=min_row
+    ):
+        for num_coluna, valor in enumerate(linha, start=min_col):
+            valores[f"{get_column_letter(num_coluna)}{num_linha}"] = valor
+    return valores
+
+
+def _celula_openpyxl(valor):
+    """
+    Normaliza uma celula do calamine para o que o openpyxl devolveria:
+    vazia ('') vira None e numero inteiro lido como float vira int.
+    """
+    if valor == '':
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _linhas_planilha(caminho: str, aba: str, min_col: int, max_col: int):
+    """
+    Itera as linhas de uma aba como tuplas das colunas min_col..max_col
+    (base 1, como no openpyxl). Usa o python-calamine se instalado; senao
+    openpyxl em streaming (read_only).
+    """
+    if CalamineWorkbook is not None:
+        largura = max_col - min_col + 1
+        # Arquivo aberto (e fechado) aqui: o workbook nao segura o handle do
+        # BD.xlsx (no Windows bloquearia a planilha para quem for edita-la)
+        with open(caminho, 'rb') as fh:
+            wb = CalamineWorkbook.from_filelike(fh)
+            try:
+                # skip_empty_area=False: mantem as colunas/linhas vazias
+                # iniciais, senao os indices deslocam em relacao ao openpyxl
+                linhas = wb.get_sheet_by_name(aba).to_python(skip_empty_area=False)
+            finally:
+                fechar = getattr(wb, 'close', None)
+                if fechar is not None:
+                    fechar()
+        for linha in linhas:
+            valores = tuple(_celula_openpyxl(v) for v in linha[min_col - 1:max_col])
+            yield valores + (None,) * (largura - len(valores))
+        return
+
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from wb[aba].iter_rows(min_col=min_col, max_col=max_col, values_only=True)
+    finally:
+        wb.close()
 
 
 def get_versioned_filepath(directory: str, base_name: str, extension: str) -> str:
@@ -251,12 +381,164 @@ def get_versioned_filepath(directory: str, base_name: str, extension: str) -> st
     if not os.path.exists(target):
         return target
 
-    version = 1
+    # Uma leitura do diretorio em vez de um stat por versao existente:
+    # proxima versao = maior "(N)" + 1 (no Windows os nomes nao diferem
+    # por caixa, como o os.path.exists)
+    padrao = re.compile(
+        re.escape(base_name) + r' \((\d+)\)' + re.escape(extension) + '$',
+        re.IGNORECASE if os.name == 'nt' else 0
+    )
+    version = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            m = padrao.match(entry.name)
+            if m:
+                version = max(version, int(m.group(1)))
+
+    # Garantia contra nomes equivalentes fora do padrao (ex: "(01)")
     while True:
+        version += 1
         versioned = os.path.join(directory, f"{base_name} ({version}){extension}")
         if not os.path.exists(versioned):
             return versioned
-        version += 1
+
+
+def _backoff(tentativa: int, teto: float = 30) -> float:
+    """
+    Espera antes do retry: exponencial (1s, 2s, 4s...) com teto e jitter de
+    +-50%, para que workers que falharam juntos nao tentem de novo juntos.
+    """
+    return min(teto, 2 ** tentativa) * (0.5 + random.random())
+
+
+def criar_inotify(pasta: str):
+    """
+    Cria watcher inotify na pasta (CLOSE_WRITE | MOVED_TO): o Chrome fecha o
+    arquivo ou renomeia .crdownload -> final. None se indisponivel (Windows).
+    """
+    if inotify_simple is None:
+        return None
+    try:
+        inotify = inotify_simple.INotify()
+        flags = inotify_simple.flags
+        inotify.add_watch(pasta, flags.CLOSE_WRITE | flags.MOVED_TO)
+        return inotify
+    except OSError as e:
+        log.debug(f"inotify indisponivel, usando polling: {e}")
+        return None
+
+
+class _WatcherWatchdog:
+    """
+    Adaptador do watchdog com a mesma interface usada do INotify (read/close):
+    read() acorda quando um arquivo e criado ou renomeado na pasta (o Chrome
+    renomeia .crdownload -> final ao concluir).
+    """
+
+    def __init__(self, pasta: str):
+        self._evento = threading.Event()
+        evento = self._evento
+
+        class _Handler(FileSystemEventHandler):
+            def on_created(self, event):
+                evento.set()
+
+            def on_moved(self, event):
+                evento.set()
+
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), pasta, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def read(self, timeout: Optional[int] = None) -> list:
+        """Espera ate `timeout` ms por eventos; lista vazia = timeout."""
+        ocorreu = self._evento.wait(None if timeout is None else timeout / 1000)
+        # Limpa antes de quem chamou reler a pasta: evento novo nao se perde
+        self._evento.clear()
+        return [True] if ocorreu else []
+
+    def close(self):
+        self._observer.stop()
+        self._observer.join(timeout=2)
+
+
+def criar_watcher(pasta: str):
+    """
+    Watcher de eventos da pasta de download (interface read/close):
+    inotify no Linux, watchdog nos demais sistemas. None = usar polling.
+    """
+    watcher = criar_inotify(pasta)
+    if watcher is not None or Observer is None:
+        return watcher
+    try:
+        return _WatcherWatchdog(pasta)
+    except Exception as e:
+        log.debug(f"watchdog indisponivel, usando polling: {e}")
+        return None
+
+
+def _copiar_kernel(src: str, dst: str, usar_copy_file_range: bool) -> bool:
+    """Copia via copy_file_range/sendfile. Retorna False se nao suportado."""
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            fd_in, fd_out = fsrc.fileno(), fdst.fileno()
+            restante = os.fstat(fd_in).st_size
+            while restante > 0:
+                if usar_copy_file_range:
+                    n = os.copy_file_range(fd_in, fd_out, restante)
+                else:
+                    n = os.sendfile(fd_out, fd_in, None, restante)
+                if n == 0:
+                    break
+                restante -= n
+        return restante == 0
+    except OSError:
+        return False
+
+
+def copiar_rapido(src: str, dst: str, hardlink: bool = False):
+    """
+    Copia arquivo no kernel quando possivel: copy_file_range (reflink em
+    Btrfs/XFS), depois sendfile; senao shutil.copyfile.
+    hardlink=True tenta antes os.link (O(1), mesmo volume); entre volumes
+    (EXDEV) ou sem suporte cai na copia.
+    """
+    if hardlink:
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass
+    if hasattr(os, 'copy_file_range') and _copiar_kernel(src, dst, True):
+        return
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux') \
+            and _copiar_kernel(src, dst, False):
+        return
+    shutil.copyfile(src, dst)
+
+
+def pasta_local_usuario(*partes: str) -> str:
+    """
+    Pasta local do usuario para arquivos da ferramenta (perfil do Chrome,
+    caches): %LOCALAPPDATA% no Windows, $XDG_CACHE_HOME ou ~/.cache nos
+    demais; temp do sistema em ultimo caso. Nunca a pasta compartilhada.
+    """
+    base = (os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    if not base or base.startswith('~'):
+        base = tempfile.gettempdir()
+    return os.path.join(base, 'etl_qore', *partes)
+
+
+@functools.lru_cache(maxsize=4096)
+def _pasta_carteiras(base_fundos: str, pasta_fundo: str, ano: int, mes: int) -> str:
+    """Pasta de carteiras do fundo: <base>/<fundo>/06. Carteiras/<ano>/<MM - Mes>."""
+    mes_str = f"{mes:02d}"
+    return os.path.join(
+        base_fundos, pasta_fundo, '06. Carteiras',
+        str(ano), f"{mes_str} - {MESES_EXTENSO.get(mes_str, '')}"
+    )
 
 
 # =============================================================================
@@ -270,39 +552,28 @@ class FundoManager:
         self.bd_path = bd_path
         self.fundos: Dict[str, str] = {}  # {nome_fundo: pasta_destino}
         self.siglas: Dict[str, str] = {}  # {nome_fundo: sigla_busca}
+        self._bloko_set: frozenset = frozenset()  # fundos BLOKO (ver is_bloko)
 
     def carregar_fundos(self) -> bool:
-        """Carrega fundos do arquivo BD.xlsx (otimizado)."""
+        """
+        Carrega fundos do arquivo BD.xlsx (otimizado).
+        Reaproveita o cache em disco (pasta local do usuario) quando a assinatura
+        (mtime, tamanho) do arquivo nao mudou desde o ultimo parse.
+        """
         try:
-            # Otimizado: le apenas colunas necessarias (B=1, C=2, J=9)
-            df = pd.read_excel(
-                self.bd_path,
-                sheet_name='BD',
-                engine='openpyxl',
-                header=None,
-                usecols=[1, 2, 9],
-                dtype=str
-            )
-
-            for _, row in df.iterrows():
-                flag_qore = str(row.iloc[2] or '').strip().upper()  # Coluna J (indice 2 apos usecols)
+            assinatura = (os.path.getmtime(self.bd_path), os.path.getsize(self.bd_path))
 
-                if flag_qore in {'SIM', 'S', 'TRUE', 'YES', 'VERDADEIRO', 'QORE'}:
-                    apelido = row.iloc[0]  # Coluna B (indice 0 apos usecols)
-                    caminho = row.iloc[1]  # Coluna C (indice 1 apos usecols)
+            if self._carregar_cache(assinatura):
+                log.info(f"Carregados {len(self.fundos)} fundos QORE (cache)")
+                return len(self.fundos) > 0
 
-                    if pd.notna(apelido) and pd.notna(caminho):
-                        apelido_clean = str(apelido).strip()
-                        caminho_clean = str(caminho).strip()
-
-                        if apelido_clean and caminho_clean:
-                            # Tratamento especial BLOKO
-                            nome_final = self._processar_nome_bloko(apelido_clean)
-                            self.fundos[nome_final] = caminho_clean
+            self._ler_bd()
 
             # Gera siglas
             self._gerar_siglas()
 
+            self._salvar_cache(assinatura)
+
             log.info(f"Carregados {len(self.fundos)} fundos QORE")
             return len(self.fundos) > 0
 
@@ -310,22 +581,110 @@ class FundoManager:
             log.error(f"Falha ao ler BD.xlsx: {e}")
             return False
 
-    def _processar_nome_bloko(self, apelido: str) -> str:
-        """Processa nomes especiais de fundos BLOKO."""
-        partes = apelido.split()
+    def _ler_bd(self):
+        """Le a aba BD do BD.xlsx e popula self.fundos."""
+        # Leitura em streaming, sem montar DataFrame (calamine se instalado).
+        # Colunas B..J -> row[0]=B, row[1]=C, row[8]=J
+        for row in _linhas_planilha(self.bd_path, 'BD', min_col=2, max_col=10):
+            # Flag primeiro: a maioria das linhas e descartada aqui,
+            # sem normalizar apelido/caminho
+            if _texto_celula(row[8]).upper() not in FLAGS_QORE:
+                continue
 
-        if len(partes) > 1 and partes[1] == 'BLOKO':
-            if partes[0] == 'FIP':
-                return 'BLOKO URBANISMO'
-            else:
-                return 'BLOKO FIM'
+            apelido_clean = _texto_celula(row[0])
+            caminho_clean = _texto_celula(row[1])
+
+            if apelido_clean and caminho_clean:
+                # Tratamento especial BLOKO
+                nome_final = self._processar_nome_bloko(apelido_clean)
+                self.fundos[nome_final] = caminho_clean
+
+    # Versao do formato do cache: incrementar quando o parse (colunas, flags,
+    # tratamento BLOKO) mudar, invalidando caches gravados por versoes antigas
+    _CACHE_VERSAO = 1
+
+    @property
+    def _cache_path(self) -> str:
+        """
+        Caminho do cache do parse do BD.xlsx: pasta local do usuario, chave =
+        hash do caminho do BD (nada e gravado na pasta compartilhada).
+        """
+        chave = zlib.crc32(os.path.normcase(os.path.abspath(self.bd_path)).encode()) & 0xffffffff
+        return pasta_local_usuario('cache', f'bd_{chave:08x}.json')
+
+    def _carregar_cache(self, assinatura: Tuple[float, int]) -> bool:
+        """Carrega fundos/siglas do cache se versao e assinatura do BD.xlsx baterem."""
+        try:
+            with open(self._cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('versao') != self._CACHE_VERSAO:
+                return False
+            if tuple(cache.get('assinatura') or ()) != tuple(assinatura):
+                return False
+            fundos = cache['fundos']
+            siglas = cache['siglas']
+            if not isinstance(fundos, dict) or not isinstance(siglas, dict):
+                return False
+        except Exception:
+            return False
+
+        self.fundos = fundos
+        self.siglas = siglas
+        self._bloko_set = frozenset(n for n in fundos if 'BLOKO' in n.upper())
+        return True
+
+    def _salvar_cache(self, assinatura: Tuple[float, int]):
+        """
+        Grava o resultado do parse do BD.xlsx (falha aqui nao e critica).
+        Escrita atomica (temporario + os.replace): outra execucao lendo ao
+        mesmo tempo nunca ve o arquivo pela metade.
+        """
+        pasta = os.path.dirname(self._cache_path)
+        tmp = None
+        try:
+            os.makedirs(pasta, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.bd_cache_', suffix='.tmp', dir=pasta)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'versao': self._CACHE_VERSAO,
+                    'assinatura': list(assinatura),
+                    'fundos': self.fundos,
+                    'siglas': self.siglas,
+                }, f, ensure_ascii=False)
+            os.replace(tmp, self._cache_path)
+            tmp = None
+        except Exception as e:
+            log.debug(f"Nao foi possivel gravar cache do BD.xlsx: {e}")
+        finally:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+
+    # Cache apelido -> nome final (poucos fundos BLOKO, repetidos a cada carga)
+    _BLOKO_CACHE: Dict[str, str] = {}
 
-        return apelido
+    def _processar_nome_bloko(self, apelido: str) -> str:
+        """Processa nomes especiais de fundos BLOKO."""
+        # Caminho rapido: a grande maioria das linhas nao e BLOKO
+        if 'BLOKO' not in apelido:
+            return apelido
+
+        nome = self._BLOKO_CACHE.get(apelido)
+        if nome is None:
+            nome = apelido
+            partes = apelido.split()
+            if len(partes) > 1 and partes[1] == 'BLOKO':
+                nome = 'BLOKO URBANISMO' if partes[0] == 'FIP' else 'BLOKO FIM'
+            self._BLOKO_CACHE[apelido] = nome
+        return nome
 
     def _gerar_siglas(self):
         """Gera mapa de siglas para busca."""
+        self._bloko_set = frozenset(n for n in self.fundos if 'BLOKO' in n.upper())
         for nome in self.fundos:
-            if 'BLOKO' in nome.upper():
+            if nome in self._bloko_set:
                 # BLOKO usa nome completo
                 self.siglas[nome] = nome
             else:
@@ -339,6 +698,11 @@ class FundoManager:
 
     def is_bloko(self, nome_fundo: str) -> bool:
         """Verifica se e um fundo BLOKO."""
+        if nome_fundo in self._bloko_set:
+            return True
+        if nome_fundo in self.fundos:
+            return False
+        # Nome fora do BD: avalia direto
         return 'BLOKO' in nome_fundo.upper()
 
     def get_bloko_pattern(self, nome_fundo: str) -> str:
@@ -356,10 +720,19 @@ class FileHandler:
     UNIFICADO: mesma logica para fundos normais e BLOKO.
     """
 
+    # True = destinos secundarios no mesmo volume viram hardlink do primeiro
+    # (sem copiar bytes). Os nomes compartilham o conteudo: editar um arquivo
+    # no lugar altera o outro. Padrao: copia real
+    HARDLINK_DESTINOS = False
+
     def __init__(self, temp_path: str, paths: QorePaths):
         self.temp_path = temp_path
         self.paths = paths
         self.timeouts = Timeouts()
+        # Diretorios de destino ja criados (evita makedirs repetido)
+        self._dirs_criados = set()
+        # Destinos ja resolvidos por (tipo, ano, mes, pasta do fundo)
+        self._destinos: Dict[Tuple[str, int, int, str], List[str]] = {}
 
     def limpar_temp(self):
         """Limpa pasta temporaria de downloads."""
@@ -367,154 +740,36 @@ class FileHandler:
             os.makedirs(self.temp_path, exist_ok=True)
             return
 
-        for item in os.listdir(self.temp_path):
-            item_path = os.path.join(self.temp_path, item)
+        def remover(entry: os.DirEntry):
             try:
-                if os.path.isfile(item_path):
-                    os.unlink(item_path)
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
-            except Exception:
-                pass
-
-        log.debug(f"Pasta temp limpa: {self.temp_path}")
-
-    def aguardar_download(self, extension: str, sigla: str = '', timeout: int = None) -> Optional[Path]:
-        """
-        Aguarda arquivo aparecer na pasta temp.
-        Usa polling inteligente em vez de sleep fixo.
-        """
-        timeout = timeout or self.timeouts.DOWNLOAD_WAIT
-        end_time = datetime.now().timestamp() + timeout
-
-        while datetime.now().timestamp() < end_time:
-            # Lista arquivos validos (nao temporarios)
-            arquivos = [
-                f for f in Path(self.temp_path).glob(f'*{extension}')
-                if not f.name.endswith(('.crdownload', '.tmp', '.partial'))
-            ]
-
-            if arquivos:
-                # Ordena por data de modificacao (mais recente primeiro)
-                arquivos.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-
-                # Se tem sigla, filtra
-                if sigla:
-                    for arq in arquivos:
-                        if sigla.lower() in arq.name.lower():
-                            # Verifica se download completou (tamanho estavel)
-                            if self._download_completo(arq):
-                                return arq
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
                 else:
-                    if self._download_completo(arquivos[0]):
-                        return arquivos[0]
-
-            # Polling interval
-            time.sleep(self.timeouts.DOWNLOAD_CHECK_INTERVAL)
-
-        return None
-
-    def _download_completo(self, arquivo: Path) -> bool:
-        """
-        Verifica se o download do arquivo completou.
-        Otimizado: verifica .crdownload primeiro (sem sleep).
-        """
-        try:
-            # Verifica se existe arquivo temporario do Chrome (.crdownload)
-            crdownload = Path(str(arquivo) + '.crdownload')
-            if crdownload.exists():
-                return False
-
-            # Verifica tamanho minimo
-            size1 = arquivo.stat().st_size
-            if size1 == 0:
-                return False
-
-            # Verifica estabilidade do tamanho (sleep reduzido)
-            time.sleep(0.2)
-            size2 = arquivo.stat().st_size
-            return size1 == size2
-
-        except Exception:
-            return False
-
-    def processar_zip_lote(self, fundo_nome: str, fundo_manager: FundoManager,
-                          report_type: str, data_referencia: datetime) -> int:
-        """
-        Processa arquivos de download em lote (ZIP).
-        UNIFICADO: mesma logica para BLOKO e outros fundos.
-        """
-        # Encontra o ZIP
-        zips = list(Path(self.temp_path).glob('*.zip'))
-        if not zips:
-            log.warning("Nenhum ZIP encontrado na pasta temp")
-            return 0
-
-        zip_file = max(zips, key=lambda x: x.stat().st_mtime)
-        log.info(f"Extraindo ZIP: {zip_file.name}")
-
-        # Cria pasta temp de extracao
-        temp_extract = Path(self.temp_path) / 'temp_extract'
-        temp_extract.mkdir(exist_ok=True)
-
-        try:
-            # Extrai
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(temp_extract)
-
-            # Remove ZIP
-            zip_file.unlink()
-
-            # Processa arquivos extraidos
-            config = REPORT_CONFIGS.get(report_type.upper())
-            if not config:
-                return 0
-
-            arquivos_processados = 0
-
-            # Define padrao de busca
-            if fundo_manager.is_bloko(fundo_nome):
-                padrao = fundo_manager.get_bloko_pattern(fundo_nome)
-            else:
-                padrao = fundo_manager.get_sigla(fundo_nome).lower()
-
-            for arquivo in temp_extract.glob(f'*{config.extension}'):
-                # Verifica se arquivo pertence ao fundo
-                if padrao and padrao.lower() not in arquivo.name.lower():
-                    continue
-
-                # Extrai data do nome do arquivo
-                data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
-                if not data_arquivo:
-                    data_arquivo = data_referencia
-
-                # Move para destinos
-                if self._mover_arquivo(
-                    arquivo, fundo_nome, data_arquivo, report_type,
-                    fundo_manager.fundos.get(fundo_nome, '')
-                ):
-                    arquivos_processados += 1
-
-            return arquivos_processados
+                    os.unlink(entry.path)
+            except OSError:
+                pass
 
-        finally:
-            # Limpa pasta de extracao
-            if temp_extract.exists():
-                shutil.rmtree(temp_extract, ignore_errors=True)
+        # scandir: DirEntry ja traz o tipo do arquivo (sem stat extra por item).
+        # Remocoes em paralelo: unlink/rmtree esperam metadados do FS, nao CPU
+        with os.scandir(self.temp_path) as entries:
+            itens = list(entries)
+        if itens:
+            with ThreadPoolExecutor(max_workers=min(8, len(itens))) as executor:
+                list(executor.map(remover, itens))
 
-    def processar_arquivo_individual(self, arquivo: Path, fundo_nome: str,
-                                    data: datetime, report_type: str,
-                                    pasta_fundo: str) -> bool:
-        """Processa um arquivo individual (modo nao-lote)."""
-        return self._mover_arquivo(arquivo, fundo_nome, data, report_type, pasta_fundo)
+        log.debug(f"Pasta temp limpa: {self.temp_path}")
 
     def _mover_arquivo(self, arquivo: Path, fundo_nome: str, data: datetime,
-                      report_type: str, pasta_fundo: str) -> bool:
+                      report_type: str, pasta_fundo: str,
+                      escrever: Optional[Callable[[str], None]] = None,
+                      config: Optional[ReportConfig] = None) -> bool:
         """
         Move arquivo para destino(s) final(is).
         UNIFICADO: mesma logica para todos os tipos.
+        Se `escrever` for informado, ele grava o primeiro destino no lugar do move
+        (ex: stream direto do ZIP). `config` evita o lookup por arquivo.
         """
-        config = REPORT_CONFIGS.get(report_type.upper())
+        config = config or REPORT_CONFIGS.get(report_type.upper())
         if not config:
             return False
 
@@ -525,25 +780,38 @@ class FileHandler:
             # Determina destinos
             destinos = self._get_destinos(report_type, data, pasta_fundo)
 
-            primeiro_destino = None
+            if not destinos:
+                return True
 
-            for i, destino_dir in enumerate(destinos):
-                os.makedirs(destino_dir, exist_ok=True)
+            # Primeiro destino: move (ou grava direto da origem)
+            self._garantir_dir(destinos[0])
+            primeiro_destino = get_versioned_filepath(
+                destinos[0], nome_base, config.extension
+            )
+            if escrever:
+                escrever(primeiro_destino)
+            else:
+                shutil.move(str(arquivo), primeiro_destino)
+            log.info(f"{report_type} movido para: {Path(primeiro_destino).name}")
 
+            # Demais destinos: copias em paralelo (volumes/compartilhamentos
+            # distintos); com um so destino extra copia direto, sem pool
+            def copiar(destino_dir: str) -> str:
+                self._garantir_dir(destino_dir)
                 caminho_final = get_versioned_filepath(
                     destino_dir, nome_base, config.extension
                 )
+                copiar_rapido(primeiro_destino, caminho_final, self.HARDLINK_DESTINOS)
+                return caminho_final
 
-                if i == 0:
-                    # Primeiro destino: move
-                    shutil.move(str(arquivo), caminho_final)
-                    primeiro_destino = caminho_final
-                    log.info(f"{report_type} movido para: {Path(caminho_final).name}")
-                else:
-                    # Demais destinos: copia
-                    if primeiro_destino and os.path.exists(primeiro_destino):
-                        shutil.copy(primeiro_destino, caminho_final)
-                        log.info(f"{report_type} copiado para: {Path(caminho_final).parent.name}")
+            secundarios = destinos[1:]
+            if len(secundarios) > 1:
+                with ThreadPoolExecutor(max_workers=len(secundarios)) as executor:
+                    copiados = list(executor.map(copiar, secundarios))
+            else:
+                copiados = [copiar(d) for d in secundarios]
+            for caminho_final in copiados:
+                log.info(f"{report_type} copiado para: {Path(caminho_final).parent.name}")
 
             return True
 
@@ -551,34 +819,46 @@ class FileHandler:
             log.error(f"Falha ao mover arquivo: {e}")
             return False
 
+    def _garantir_dir(self, destino_dir: str):
+        """Cria diretorio de destino uma unica vez por execucao."""
+        if destino_dir not in self._dirs_criados:
+            os.makedirs(destino_dir, exist_ok=True)
+            self._dirs_criados.add(destino_dir)
+
     def _get_destinos(self, report_type: str, data: datetime, pasta_fundo: str) -> List[str]:
-        """Retorna lista de diretorios de destino."""
+        """
+        Retorna lista de diretorios de destino.
+        Resolvida uma vez por (tipo, ano, mes, fundo); os demais arquivos do
+        mesmo fundo reaproveitam.
+        """
+        tipo = report_type.upper()
+        chave = (tipo, data.year, data.month, pasta_fundo)
+        destinos = self._destinos.get(chave)
+        if destinos is not None:
+            return destinos
+
         destinos = []
-        ano = data.strftime('%Y')
-        mes = data.strftime('%m')
 
-        if report_type.upper() == 'PDF':
+        if tipo == 'PDF':
             # Destino 1: Pasta do fundo
             if pasta_fundo:
-                mes_formatado = f"{mes} - {MESES_EXTENSO.get(mes, '')}"
-                path_fundo = os.path.join(
-                    self.paths.base_fundos, pasta_fundo,
-                    '06. Carteiras', ano, mes_formatado
-                )
-                destinos.append(path_fundo)
+                destinos.append(_pasta_carteiras(
+                    self.paths.base_fundos, pasta_fundo, data.year, data.month
+                ))
 
             # Destino 2: Monitoramento
             if self.paths.pdf_monitoramento:
                 destinos.append(self.paths.pdf_monitoramento)
 
-        elif report_type.upper() == 'EXCEL':
+        elif tipo == 'EXCEL':
             if self.paths.excel:
                 destinos.append(self.paths.excel)
 
-        elif report_type.upper() == 'XML':
+        elif tipo == 'XML':
             if self.paths.xml:
                 destinos.append(self.paths.xml)
 
+        self._destinos[chave] = destinos
         return destinos
 
 
@@ -632,9 +912,31 @@ class SeleniumDriver:
         # Estrategia de carregamento mais rapida
         chrome_options.page_load_strategy = 'eager'
 
+        # Perfil persistente: reaproveita cache HTTP/cookies do portal entre
+        # execucoes. Guarda sessao ativa: fica na pasta local do usuario, nunca
+        # ao lado da pasta de download (que pode ser compartilhada)
+        profile_dir = pasta_local_usuario('chrome_profile')
+        arg_profile = f'--user-data-dir={profile_dir}'
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(self.timeouts.ELEMENT_PRESENT)
+            os.makedirs(profile_dir, exist_ok=True)
+            chrome_options.add_argument(arg_profile)
+            chrome_options.add_argument('--disk-cache-size=536870912')
+        except OSError:
+            pass
+
+        try:
+            try:
+                self.driver = webdriver.Chrome(options=chrome_options)
+            except Exception as e:
+                if arg_profile not in chrome_options.arguments:
+                    raise
+                # Perfil em uso por outra instancia: sobe sem perfil persistente
+                log.warning(f"Perfil Chrome indisponivel, usando perfil temporario: {e}")
+                chrome_options.arguments.remove(arg_profile)
+                self.driver = webdriver.Chrome(options=chrome_options)
+            # Sem implicit wait: sondagens opcionais (ex: spinner) retornam na
+            # hora; esperas sao sempre explicitas via WebDriverWait
+            self.driver.implicitly_wait(0)
             log.info("Chrome Driver iniciado com sucesso")
         except Exception as e:
             log.critical(f"Falha ao iniciar Chrome: {e}")
@@ -676,12 +978,15 @@ class SeleniumDriver:
                 EC.element_to_be_clickable((by, value))
             )
 
-            # Scroll para elemento se necessario
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'center'});", elemento
-            )
-
-            elemento.click()
+            # Clica direto: o WebDriver ja rola ate o elemento quando preciso.
+            # scrollIntoView (round-trip extra) so quando o clique e bloqueado
+            try:
+                elemento.click()
+            except (ElementClickInterceptedException, ElementNotInteractableException):
+                self.driver.execute_script(
+                    "arguments[0].scrollIntoView({block: 'center'});", elemento
+                )
+                elemento.click()
             return True
 
         except TimeoutException:
@@ -716,13 +1021,6 @@ class SeleniumDriver:
         except TimeoutException:
             return None
 
-    def encontrar_elementos(self, by: By, value: str) -> list:
-        """Encontra multiplos elementos."""
-        try:
-            return self.driver.find_elements(by, value)
-        except Exception:
-            return []
-
     def preencher_campo(self, by: By, value: str, texto: str) -> bool:
         """Preenche campo de texto."""
         elemento = self.encontrar_elemento(by, value)
@@ -735,26 +1033,6 @@ class SeleniumDriver:
                 pass
         return False
 
-    def preencher_data_js(self, element_id: str, data: datetime) -> bool:
-        """Preenche campo de data usando JavaScript (mais confiavel)."""
-        try:
-            data_iso = data.strftime('%Y-%m-%d')
-            script = f'''
-                var campo = document.getElementById('{element_id}');
-                if (campo) {{
-                    campo.value = '{data_iso}';
-                    ['focus', 'input', 'change', 'blur'].forEach(function(evt) {{
-                        campo.dispatchEvent(new Event(evt, {{bubbles: true}}));
-                    }});
-                    return true;
-                }}
-                return false;
-            '''
-            return self.driver.execute_script(script)
-        except Exception as e:
-            log.error(f"Erro ao preencher data: {e}")
-            return False
-
     def aguardar_url_conter(self, texto: str, timeout: int = None) -> bool:
         """Aguarda URL conter determinado texto."""
         timeout = timeout or self.timeouts.PAGE_LOAD
@@ -795,60 +1073,6 @@ class SeleniumDriver:
             # Apenas em caso de erro, pequeno delay de fallback
             time.sleep(0.5)
 
-    def aguardar_elemento_visivel(self, by: By, value: str, timeout: int = None) -> bool:
-        """Aguarda elemento ficar visivel na pagina."""
-        timeout = timeout or self.timeouts.ELEMENT_PRESENT
-
-        try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located((by, value))
-            )
-            return True
-        except TimeoutException:
-            return False
-
-    def aguardar_breve(self):
-        """
-        Aguarda breve para operacoes que precisam de pequeno delay.
-        Usado apos preenchimento de campos, etc.
-        """
-        time.sleep(0.5)
-
-    # =========================================================================
-    # METODOS PARA GERENCIAMENTO DE ABAS (V13 - Paralelo)
-    # =========================================================================
-
-    def abrir_nova_aba(self) -> str:
-        """Abre uma nova aba e retorna o handle."""
-        self.driver.execute_script("window.open('');")
-        nova_aba = self.driver.window_handles[-1]
-        return nova_aba
-
-    def trocar_para_aba(self, handle: str):
-        """Troca para uma aba especifica pelo handle."""
-        self.driver.switch_to.window(handle)
-
-    def fechar_aba_atual(self):
-        """Fecha a aba atual."""
-        self.driver.close()
-
-    def get_aba_principal(self) -> str:
-        """Retorna o handle da aba principal (primeira)."""
-        return self.driver.window_handles[0]
-
-    def get_todas_abas(self) -> list:
-        """Retorna lista de handles de todas as abas."""
-        return self.driver.window_handles
-
-    def fechar_todas_abas_extras(self):
-        """Fecha todas as abas exceto a principal."""
-        principal = self.get_aba_principal()
-        for handle in self.driver.window_handles:
-            if handle != principal:
-                self.driver.switch_to.window(handle)
-                self.driver.close()
-        self.driver.switch_to.window(principal)
-
     def get_cookies(self) -> list:
         """Retorna cookies da sessao atual."""
         return self.driver.get_cookies()
@@ -862,26 +1086,103 @@ class WorkerChrome:
     """
     Worker que executa em thread separada com seu proprio Chrome.
     Usado para downloads verdadeiramente paralelos.
-    Cada worker faz seu proprio login (mais robusto que cookies).
-    Cada worker tem sua propria pasta de download (evita conflitos).
+    Reaproveita os cookies da sessao principal; faz login proprio se falharem.
+    O worker 0 pode adotar o proprio driver principal (adotar), sem subir Chrome.
+    Downloads: cada worker usa sua propria pasta (evita conflitos).
+    """
+
+    # Modal "Download em Lote": preenche datas via setter nativo + eventos
+    # (React/Vue). Retorna se os dois campos existiam; o clique em Download
+    # fica para depois de o modal refletir as datas (_modal_pronto)
+    _JS_MODAL_DATAS = """
+        var setter = Object.getOwnPropertyDescriptor(
+            window.HTMLInputElement.prototype, 'value'
+        ).set;
+        function setValueWithEvents(element, value) {
+            setter.call(element, value);
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+            element.dispatchEvent(new Event('change', { bubbles: true }));
+        }
+        var campoIni = document.getElementById('dataInicial');
+        var campoFim = document.getElementById('dataFinal');
+        if (campoIni) { setValueWithEvents(campoIni, arguments[0]); }
+        if (campoFim) { setValueWithEvents(campoFim, arguments[1]); }
+        return !!(campoIni && campoFim);
+    """
+
+    # Login: preenche email/senha (setter nativo + eventos) e submete o form
+    _JS_LOGIN = """
+        var email = document.querySelector('input[name="email"]');
+        var senha = document.querySelector('input[name="password"]');
+        if (!email || !senha) { return false; }
+        var setter = Object.getOwnPropertyDescriptor(
+            window.HTMLInputElement.prototype, 'value'
+        ).set;
+        [[email, arguments[0]], [senha, arguments[1]]].forEach(function(par) {
+            setter.call(par[0], par[1]);
+            par[0].dispatchEvent(new Event('input', { bubbles: true }));
+            par[0].dispatchEvent(new Event('change', { bubbles: true }));
+        });
+        var form = senha.closest('form');
+        if (!form) { return false; }
+        if (form.requestSubmit) { form.requestSubmit(); } else { form.submit(); }
+        return true;
     """
 
+    # Recursos bloqueados na rede (CDP Network.setBlockedURLs)
+    URLS_BLOQUEADAS = [
+        '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg',
+        '*.woff', '*.woff2', '*.ttf', '*.mp4',
+        '*google-analytics*', '*hotjar*', '*segment.io*', '*sentry*',
+    ]
+    # CSS desligado por padrao: sem ele modais/dropdowns ficam sempre
+    # "visiveis" e os waits de visibilidade perdem o sentido
+    BLOQUEAR_CSS = False
+    # Workers sem janela (--headless=new). Desligado: o fluxo do modal de
+    # Download em Lote e do download em si nao foi validado headless no portal
+    HEADLESS = False
+
     def __init__(self, worker_id: int, base_temp_path: str, credentials: QoreCredentials,
-                 datas, report_config: ReportConfig):
+                 datas, report_config: ReportConfig, cookies: Optional[List[dict]] = None,
+                 local_storage: Optional[List[str]] = None):
         self.worker_id = worker_id
+        # Sessao ja autenticada do driver principal (evita login):
+        # cookies CDP e [origin, JSON do localStorage]
+        self.cookies = cookies
+        self.local_storage = local_storage
         self.base_temp_path = base_temp_path
-        # Cria pasta exclusiva para este worker
-        self.temp_path = str(Path(base_temp_path) / f'worker_{worker_id}')
+        # Pasta exclusiva para este worker; em RAM (/dev/shm) quando disponivel
+        self.temp_path = pasta_worker(base_temp_path, worker_id)
         Path(self.temp_path).mkdir(parents=True, exist_ok=True)
         self.credentials = credentials
-        self.datas = datas
-        self.report_config = report_config
         self.driver = None
+        self._driver_adotado = False  # driver principal: quem fecha e o dono
         self.timeouts = Timeouts()
-        self.lock = threading.Lock()
+        self.datas = datas
+        # Datas ISO formatadas uma vez (argumentos dos scripts JS)
+        self._data_ini = datas.data_inicial.strftime('%Y-%m-%d')
+        self._data_fim = datas.data_final.strftime('%Y-%m-%d')
+        self.report_config = report_config
+        texto_botao = report_config.button_text
+        self._loc_botao = (By.XPATH, f"//button[contains(., '{texto_botao}')]")
+
+        # Localizadores montados uma vez (CSS onde nao depende de texto)
+        self._loc_menus = (By.CSS_SELECTOR, 'div[data-kt-menu-trigger="click"]')
+        self._loc_menu_ellipsis = (By.XPATH, XPATH_MENU_ELLIPSIS)
+        self._loc_link_lote = (By.XPATH, '//a[contains(., "Download em Lote")]')
+        self._loc_data_inicial = (By.ID, 'dataInicial')
+        self._loc_botao_modal = (
+            By.XPATH, '//div[contains(@class, "modal")]//button[contains(., "Download")]'
+        )
+        self._zips_antes = 0  # ZIPs ja presentes na pasta (fundos anteriores)
+        self._watcher = None  # eventos da pasta do worker (inotify/watchdog)
+        self._wait_curto: Optional[WebDriverWait] = None  # criados em iniciar()
+        self._wait_longo: Optional[WebDriverWait] = None
 
     def iniciar(self) -> bool:
         """Inicia Chrome e faz login proprio."""
+        self._driver_adotado = False
+        self._abrir_watcher()
         try:
             chrome_options = Options()
 
@@ -897,10 +1198,28 @@ class WorkerChrome:
             chrome_options.add_experimental_option('prefs', prefs)
 
             # Argumentos de performance (mais leve para workers)
+            if self.HEADLESS:
+                # Sem janela: sem composicao/pintura
+                chrome_options.add_argument('--headless=new')
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
             chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1200,800')
+            chrome_options.add_argument('--window-size=1200,800')  # layout depende disso
+            chrome_options.add_argument('--hide-scrollbars')
+            chrome_options.add_argument('--mute-audio')
+            chrome_options.add_argument('--disable-background-networking')
+            chrome_options.add_argument('--disable-background-timer-throttling')
+            chrome_options.add_argument('--disable-renderer-backgrounding')
+            chrome_options.add_argument('--disable-breakpad')
+            chrome_options.add_argument('--disable-sync')
+            chrome_options.add_argument('--metrics-recording-only')
+            chrome_options.add_argument('--no-first-run')
+            chrome_options.add_argument('--disable-features=Translate,BackForwardCache,InterestCohort')
+            if self.temp_path.startswith(PASTA_RAM):
+                # Cache HTTP tambem em RAM
+                chrome_options.add_argument(
+                    f"--disk-cache-dir={os.path.join(self.temp_path, '.cache')}"
+                )
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-infobars')
             chrome_options.add_argument('--disable-notifications')
@@ -909,11 +1228,15 @@ class WorkerChrome:
             chrome_options.add_argument('--blink-settings=imagesEnabled=false')
             chrome_options.page_load_strategy = 'eager'
 
+            # Conexao com o chromedriver ja e keep-alive (padrao do Selenium 4):
+            # um socket reaproveitado por todos os comandos deste worker.
+            # Nao ha pool para compartilhar entre workers - cada um fala com
+            # seu proprio chromedriver (host:porta distintos)
             self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(self.timeouts.ELEMENT_PRESENT)
+            self._configurar_driver()
 
-            # Faz login proprio
-            if self._fazer_login():
+            # Reaproveita a sessao do driver principal; login proprio se falhar
+            if self._importar_sessao() or self._fazer_login():
                 log.info(f"  Worker {self.worker_id}: Chrome iniciado e logado")
                 return True
             else:
@@ -924,6 +1247,90 @@ class WorkerChrome:
             log.error(f"  Worker {self.worker_id}: Falha ao iniciar - {e}")
             return False
 
+    def adotar(self, driver) -> bool:
+        """
+        Usa um Chrome ja aberto e logado (driver principal da FASE 1) em vez
+        de subir outro: economiza um startup de Chrome e um login.
+        O driver continua sendo do dono (fechar() nao o encerra).
+        """
+        try:
+            self._abrir_watcher()
+            self.driver = driver
+            self._driver_adotado = True
+            self._configurar_driver()
+            log.info(f"  Worker {self.worker_id}: usando o driver principal (ja logado)")
+            return True
+        except Exception as e:
+            log.warning(f"  Worker {self.worker_id}: falha ao adotar driver principal - {e}")
+            self.driver = None
+            self._driver_adotado = False
+            return False
+
+    def _configurar_driver(self):
+        """Waits, pasta de download e bloqueio de recursos no driver atual."""
+        # Sem implicit wait: ele se somaria a cada poll dos WebDriverWait
+        self.driver.implicitly_wait(0)
+
+        # Waits reaproveitados em todo o fluxo; polling de 50ms (padrao 0.5s)
+        # e stale ignorado (re-render da pagina durante o wait)
+        ignorar = (NoSuchElementException, StaleElementReferenceException)
+        self._wait_curto = WebDriverWait(
+            self.driver, 5, poll_frequency=0.05, ignored_exceptions=ignorar
+        )
+        self._wait_longo = WebDriverWait(
+            self.driver, 15, poll_frequency=0.1, ignored_exceptions=ignorar
+        )
+
+        # Forca a pasta do worker via CDP: headless pode ignorar as prefs de
+        # download e o driver adotado foi criado com a pasta principal
+        self.driver.execute_cdp_cmd('Page.setDownloadBehavior', {
+            'behavior': 'allow',
+            'downloadPath': self.temp_path
+        })
+
+        # Bloqueia imagens/fontes/analytics antes do download
+        urls = self.URLS_BLOQUEADAS + (['*.css'] if self.BLOQUEAR_CSS else [])
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
+        except Exception as e:
+            log.debug(f"    Worker {self.worker_id}: setBlockedURLs indisponivel - {e}")
+
+    def _importar_sessao(self) -> bool:
+        """
+        Injeta os cookies da sessao principal (CDP Network.setCookies) e
+        confirma que o portal abre logado. False = fazer login proprio.
+        """
+        if not self.cookies:
+            return False
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': self.cookies})
+            if self.local_storage:
+                # Restaura o localStorage antes dos scripts do portal, uma vez
+                # por aba (nao sobrescreve tokens renovados depois)
+                origem, dados = self.local_storage
+                self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
+                    'source': (
+                        "(function(origem, dados) {"
+                        "  if (location.origin !== origem || sessionStorage.getItem('__qore_ls')) return;"
+                        "  Object.keys(dados).forEach(function(k) { localStorage.setItem(k, dados[k]); });"
+                        "  sessionStorage.setItem('__qore_ls', '1');"
+                        f"}})({json.dumps(origem)}, {dados});"
+                    )
+                })
+            self.driver.get(self.credentials.url)
+            logado = self._wait_curto.until(
+                lambda d: 'dashboard' in d.current_url.lower()
+                or d.find_elements(By.NAME, 'password')
+            )
+            if logado is True:
+                return True
+        except Exception as e:
+            log.debug(f"  Worker {self.worker_id}: sessao importada invalida - {e}")
+        log.info(f"  Worker {self.worker_id}: cookies nao autenticaram, fazendo login")
+        self.cookies = None
+        return False
+
     def _fazer_login(self) -> bool:
         """Faz login no QORE."""
         try:
@@ -931,19 +1338,48 @@ class WorkerChrome:
             time.sleep(1)
 
             # Email
-            email_field = WebDriverWait(self.driver, 10).until(
+            email_field = self._wait_longo.until(
                 EC.presence_of_element_located((By.NAME, 'email'))
             )
-            email_field.clear()
-            email_field.send_keys(self.credentials.email)
 
-            # Senha + Enter
-            senha_field = self.driver.find_element(By.NAME, 'password')
-            senha_field.clear()
-            senha_field.send_keys(self.credentials.senha + Keys.RETURN)
+            # Email + senha + submit numa unica chamada JS
+            enviado = False
+            try:
+                enviado = self.driver.execute_script(
+                    self._JS_LOGIN, self.credentials.email, self.credentials.senha
+                )
+            except Exception as e:
+                log.debug(f"  Worker {self.worker_id}: login via JS falhou - {e}")
+
+            if enviado:
+                # Inputs controlados (React) podem ignorar valores vindos de
+                # script: sem dashboard no wait curto e ainda no formulario,
+                # digita as credenciais
+                try:
+                    self._wait_curto.until(
+                        lambda d: 'dashboard' in d.current_url.lower()
+                    )
+                    return True
+                except TimeoutException:
+                    campos = self.driver.find_elements(By.NAME, 'email')
+                    if campos:
+                        log.debug(f"  Worker {self.worker_id}: login via JS nao entrou, digitando credenciais")
+                        email_field = campos[0]
+                        enviado = False
+
+            if not enviado:
+                email_field.clear()
+                email_field.send_keys(self.credentials.email)
+
+                # Senha + Enter
+                senha_field = self._wait_curto.until(
+                    EC.presence_of_element_located((By.NAME, 'password'))
+                )
+                senha_field.clear()
+                senha_field.send_keys(self.credentials.senha + Keys.RETURN)
 
             # Aguarda dashboard carregar
-            WebDriverWait(self.driver, 15).until(
+            self._wait_longo.until(
                 lambda d: 'dashboard' in d.current_url.lower()
             )
 
@@ -963,27 +1399,42 @@ class WorkerChrome:
         }
 
         try:
-            # Navega para URL do fundo
-            self.driver.get(url)
-            time.sleep(0.5)
+            # Navega para URL do fundo (o wait do botao cobre o carregamento)
+            botao = self._navegar_fundo(url)
+            if botao is None and self._sessao_expirada():
+                # Portal redirecionou para o login: reloga so agora, no mesmo
+                # Chrome, e tenta o fundo de novo
+                log.info(f"  Worker {self.worker_id}: sessao expirou, refazendo login")
+                if self._fazer_login():
+                    botao = self._navegar_fundo(url)
 
             # Clica no botao do tipo de relatorio
-            botao_xpath = f"//button[contains(., '{self.report_config.button_text}')]"
             try:
-                botao = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, botao_xpath))
+                if botao is None:
+                    raise TimeoutException()
+                try:
+                    botao.click()
+                except StaleElementReferenceException:
+                    # Re-render entre o wait e o clique: relocaliza uma vez
+                    self._wait_curto.until(
+                        EC.element_to_be_clickable(self._loc_botao)
+                    ).click()
+                # Aguarda o menu de opcoes (...) da tela do relatorio
+                self._wait_curto.until(
+                    EC.presence_of_element_located(self._loc_menus)
                 )
-                botao.click()
-                time.sleep(0.5)
             except Exception:
                 log.warning(f"  Worker {self.worker_id}: Botao nao encontrado para {sigla}")
                 return resultado
 
             # Inicia download em lote
+            self._zips_antes = self._contar_downloads()[0]
             if self._iniciar_download_lote():
                 # Aguarda download completar
                 if self._aguardar_download():
                     resultado['status'] = 'sucesso'
+                    # ZIP baixado: o orquestrador ja processa durante a FASE 2
+                    resultado['zip'] = self._zip_mais_recente()
                     log.info(f"  Worker {self.worker_id}: {sigla} - OK!")
                 else:
                     log.warning(f"  Worker {self.worker_id}: {sigla} - Timeout download")
@@ -995,86 +1446,74 @@ class WorkerChrome:
 
         return resultado
 
-    def _iniciar_download_lote(self) -> bool:
-        """Inicia download em lote com WebDriverWait para garantir elementos prontos."""
+    def _sessao_expirada(self) -> bool:
+        """True se a pagina atual e a tela de login (sessao do portal caiu)."""
         try:
-            # 1. Clica no menu (...) - aguarda estar clicavel
-            try:
-                menus = self.driver.find_elements(By.XPATH, '//div[@data-kt-menu-trigger="click"]')
-                for menu in menus:
-                    try:
-                        icone = menu.find_element(By.TAG_NAME, 'i')
-                        if 'ellipsis' in icone.get_attribute('class'):
-                            menu.click()
-                            break
-                    except Exception:
-                        continue
-            except Exception as e:
-                log.warning(f"    Worker {self.worker_id}: Menu nao encontrado - {e}")
-                return False
-
-            time.sleep(0.5)
+            return ('login' in self.driver.current_url.lower()
+                    or bool(self.driver.find_elements(By.NAME, 'password')))
+        except Exception:
+            return False
+
+    def _navegar_fundo(self, url: str):
+        """Abre a pagina do fundo e retorna o botao do relatorio (clicavel) ou None."""
+        self.driver.get(url)
+        try:
+            return self._wait_curto.until(
+                EC.element_to_be_clickable(self._loc_botao)
+            )
+        except TimeoutException:
+            return None
 
-            # 2. Aguarda e clica em "Download em Lote"
+    def _iniciar_download_lote(self) -> bool:
+        """Inicia download em lote com WebDriverWait para garantir elementos prontos."""
+        try:
+            # 1. Clica no menu (...) - aguarda estar clicavel
+            # XPath unico: filtra o menu com icone ellipsis no proprio navegador
             try:
-                link_download = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, '//a[contains(., "Download em Lote")]'))
+                menu = self._wait_curto.until(
+                    EC.element_to_be_clickable(self._loc_menu_ellipsis)
+                )
+                menu.click()
+            except Exception as e:
+                log.warning(f"    Worker {self.worker_id}: Menu nao encontrado - {e}")
+                return False
+
+            # 2. Aguarda dropdown abrir e clica em "Download em Lote"
+            try:
+                link_download = self._wait_curto.until(
+                    EC.element_to_be_clickable(self._loc_link_lote)
                 )
                 link_download.click()
             except Exception as e:
                 log.warning(f"    Worker {self.worker_id}: Link Download em Lote nao encontrado - {e}")
                 return False
 
-            time.sleep(0.5)
-
             # 3. Aguarda modal e preenche datas
             try:
-                WebDriverWait(self.driver, 5).until(
-                    EC.presence_of_element_located((By.ID, 'dataInicial'))
+                self._wait_curto.until(
+                    EC.presence_of_element_located(self._loc_data_inicial)
                 )
             except Exception as e:
                 log.warning(f"    Worker {self.worker_id}: Campo dataInicial nao encontrado - {e}")
                 return False
 
-            # Preenche datas via JS com eventos (para frameworks React/Vue)
-            data_ini = self.datas.data_inicial.strftime('%Y-%m-%d')
-            data_fim = self.datas.data_final.strftime('%Y-%m-%d')
-
-            self.driver.execute_script(f"""
-                function setValueWithEvents(element, value) {{
-                    var nativeInputValueSetter = Object.getOwnPropertyDescriptor(
-                        window.HTMLInputElement.prototype, 'value'
-                    ).set;
-                    nativeInputValueSetter.call(element, value);
-                    element.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                    element.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                }}
-                var dataIni = document.getElementById('dataInicial');
-                var dataFim = document.getElementById('dataFinal');
-                if (dataIni) {{ setValueWithEvents(dataIni, '{data_ini}'); }}
-                if (dataFim) {{ setValueWithEvents(dataFim, '{data_fim}'); }}
-            """)
-
-            time.sleep(0.5)
+            # 4. Preenche datas (uma chamada JS)
+            try:
+                if not self.driver.execute_script(
+                    self._JS_MODAL_DATAS, self._data_ini, self._data_fim
+                ):
+                    log.debug(f"    Worker {self.worker_id}: Campo dataFinal nao encontrado")
+            except Exception as e:
+                log.debug(f"    Worker {self.worker_id}: Preenchimento JS das datas falhou - {e}")
 
-            # 4. Clica no botao Download do modal
+            # 5. Clica em Download so quando o modal aceitou as datas
             try:
-                # Tenta xpath mais especifico primeiro (botao primario do modal)
-                botao_download = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH,
-                        '//div[contains(@class, "modal")]//button[contains(., "Download")]'))
-                )
+                botao_download = self._wait_curto.until(self._modal_pronto)
                 botao_download.click()
                 log.info(f"    Worker {self.worker_id}: Download em lote solicitado")
-            except Exception:
-                # Fallback: tenta qualquer botao Download
-                try:
-                    botao = self.driver.find_element(By.XPATH, '//button[contains(., "Download")]')
-                    self.driver.execute_script("arguments[0].click();", botao)
-                    log.info(f"    Worker {self.worker_id}: Download via JS")
-                except Exception as e2:
-                    log.warning(f"    Worker {self.worker_id}: Botao Download nao encontrado - {e2}")
-                    return False
+            except Exception as e:
+                log.warning(f"    Worker {self.worker_id}: Botao Download nao ficou disponivel - {e}")
+                return False
 
             return True
 
@@ -1082,42 +1521,265 @@ class WorkerChrome:
             log.error(f"  Worker {self.worker_id}: Erro download lote - {e}")
             return False
 
+    def _modal_pronto(self, driver):
+        """
+        Condicao de wait: datas do modal com os valores pedidos (o componente
+        controlado nao os reverteu) e botao Download habilitado. Retorna o
+        botao ou False.
+        """
+        campo_ini = driver.find_element(*self._loc_data_inicial)
+        campo_fim = driver.find_element(By.ID, 'dataFinal')
+        if (campo_ini.get_attribute('value') != self._data_ini
+                or campo_fim.get_attribute('value') != self._data_fim):
+            return False
+        botao = driver.find_element(*self._loc_botao_modal)
+        return botao if botao.is_displayed() and botao.is_enabled() else False
+
     def _aguardar_download(self, timeout: int = 60) -> bool:
         """Aguarda download do ZIP completar."""
-        start = time.time()
+        fim = time.monotonic() + timeout
         download_detectado = False
+        intervalo = self.timeouts.DOWNLOAD_POLL_MIN
 
-        while time.time() - start < timeout:
+        while time.monotonic() < fim:
             # Verifica se tem .crdownload (download em progresso)
-            crdownloads = list(Path(self.temp_path).glob('*.crdownload'))
-            zips = list(Path(self.temp_path).glob('*.zip'))
+            zips, crdownloads = self._contar_downloads()
 
             # Log de progresso (apenas primeira vez que detecta download)
             if crdownloads and not download_detectado:
                 download_detectado = True
                 log.info(f"    Worker {self.worker_id}: Download iniciado...")
 
-            # Se tem ZIP e nao tem crdownload, download completou
-            if zips and not crdownloads:
+            # Se tem ZIP novo e nao tem crdownload, download completou
+            if zips > self._zips_antes and not crdownloads:
                 return True
 
-            time.sleep(0.5)
+            if self._watcher is not None:
+                # Acorda quando um arquivo e fechado/renomeado na pasta
+                self._watcher.read(timeout=500)
+            else:
+                # Backoff: detecta rapido downloads curtos, alivia nos longos
+                time.sleep(intervalo)
+                intervalo = min(intervalo * 1.5, self.timeouts.DOWNLOAD_POLL_MAX)
 
         # Log de debug se timeout
-        crdownloads = list(Path(self.temp_path).glob('*.crdownload'))
-        zips = list(Path(self.temp_path).glob('*.zip'))
-        log.warning(f"    Worker {self.worker_id}: Timeout - ZIPs={len(zips)}, .crdownload={len(crdownloads)}")
+        zips, crdownloads = self._contar_downloads()
+        log.warning(f"    Worker {self.worker_id}: Timeout - ZIPs={zips}, .crdownload={crdownloads}")
 
         return False
 
-    def fechar(self):
-        """Fecha o Chrome deste worker."""
+    def _abrir_watcher(self):
+        """(Re)cria o watcher da pasta do worker; um por worker, nao por fundo."""
+        self._fechar_watcher()
+        self._watcher = criar_watcher(self.temp_path)
+
+    def _fechar_watcher(self):
+        """Fecha o watcher da pasta (libera o fd do inotify/thread do watchdog)."""
+        if self._watcher is not None:
+            try:
+                self._watcher.close()
+            except Exception:
+                pass
+            self._watcher = None
+
+    def _zip_mais_recente(self) -> Optional[str]:
+        """Caminho do ZIP mais recente na pasta do worker."""
+        try:
+            with os.scandir(self.temp_path) as entries:
+                zips = [(e.stat().st_mtime, e.path) for e in entries
+                        if e.name.endswith('.zip')]
+        except OSError:
+            return None
+        return max(zips)[1] if zips else None
+
+    def _contar_downloads(self) -> Tuple[int, int]:
+        """Conta (ZIPs, .crdownload) na pasta do worker numa unica passada."""
+        zips = crdownloads = 0
+        try:
+            with os.scandir(self.temp_path) as entries:
+                for e in entries:
+                    if e.name.endswith('.zip'):
+                        zips += 1
+                    elif e.name.endswith('.crdownload'):
+                        crdownloads += 1
+        except OSError:
+            pass
+        return zips, crdownloads
+
+    def is_healthy(self) -> bool:
+        """Verifica se o Chrome deste worker ainda responde."""
+        if not self.driver:
+            return False
+        try:
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def garantir_sessao(self) -> bool:
+        """
+        Reaproveita o Chrome ja logado entre fundos; so reinicia (e refaz
+        login) se a sessao caiu.
+        """
+        if self.is_healthy():
+            return True
         if self.driver:
+            log.warning(f"  Worker {self.worker_id}: sessao perdida, reiniciando Chrome")
+            self.fechar()
+        return self.iniciar()
+
+    def fechar(self, timeout: float = 5):
+        """
+        Fecha o Chrome deste worker.
+        quit() pode travar com Chrome sem resposta: espera ate `timeout`
+        segundos e entao mata chromedriver + processos filhos.
+        """
+        self._fechar_watcher()
+        if not self.driver:
+            return
+        driver, self.driver = self.driver, None
+        if self._driver_adotado:
+            # Driver principal: quem encerra e o QoreAutomation
+            self._driver_adotado = False
+            return
+
+        def sair():
             try:
-                self.driver.quit()
+                driver.quit()
             except Exception:
                 pass
 
+        thread = threading.Thread(target=sair, daemon=True)
+        thread.start()
+        thread.join(timeout)
+        if thread.is_alive():
+            log.warning(f"  Worker {self.worker_id}: quit() travado, encerrando processos")
+            _matar_arvore(getattr(getattr(driver, 'service', None), 'process', None))
+
+
+# tmpfs do Linux: downloads dos workers ficam em RAM (sem I/O de disco)
+PASTA_RAM = '/dev/shm'
+RAM_LIVRE_MIN = 512 * 1024 * 1024  # abaixo disso usa a pasta temp normal
+
+
+def pasta_worker(base_temp_path: str, worker_id: int) -> str:
+    """
+    Pasta de download do worker: /dev/shm/qore_<hash base>_worker_<id> se o
+    tmpfs existir e tiver espaco; senao <base>/worker_<id>. Deterministica
+    (o orquestrador recalcula na FASE 3, inclusive com workers em processos).
+    """
+    if os.path.ismount(PASTA_RAM):
+        try:
+            if shutil.disk_usage(PASTA_RAM).free >= RAM_LIVRE_MIN:
+                return _pasta_worker_ram(base_temp_path, worker_id)
+        except OSError:
+            pass
+    return str(Path(base_temp_path) / f'worker_{worker_id}')
+
+
+def _pasta_worker_ram(base_temp_path: str, worker_id: int) -> str:
+    """Caminho da pasta do worker no tmpfs (chave = hash da pasta temp base)."""
+    chave = zlib.crc32(os.path.abspath(base_temp_path).encode()) & 0xffffffff
+    return os.path.join(PASTA_RAM, f'qore_{chave:08x}_worker_{worker_id}')
+
+
+def _matar_arvore(processo):
+    """Mata um processo (Popen) e seus filhos (Chrome) - filhos so com psutil."""
+    if processo is None:
+        return
+    if psutil is not None:
+        try:
+            for filho in psutil.Process(processo.pid).children(recursive=True):
+                try:
+                    filho.kill()
+                except psutil.Error:
+                    pass
+        except psutil.Error:
+            pass
+    try:
+        processo.kill()
+    except OSError:
+        pass
+
+
+def _consumir_fila_fundos(worker: WorkerChrome, fila_fundos, fila_resultados):
+    """Loop de consumo da fila de fundos por um worker (thread ou processo)."""
+    while True:
+        fundo_info = fila_fundos.get()
+        if fundo_info is None:
+            break
+        result = {
+            'nome': fundo_info['nome'],
+            'sigla': fundo_info['sigla'],
+            'status': 'erro'
+        }
+        try:
+            # Workers que falharam no login tentam de novo aqui
+            if worker.garantir_sessao():
+                result = worker.processar_fundo(
+                    fundo_info['url'],
+                    fundo_info['sigla'],
+                    fundo_info['nome']
+                )
+        except Exception as e:
+            log.error(f"Worker {worker.worker_id} falhou: {e}")
+        fila_resultados.put(result)
+
+
+def _worker_processo(worker_id: int, worker_kwargs: dict, fila_fundos, fila_resultados):
+    """Ponto de entrada de um worker em processo separado."""
+    worker = WorkerChrome(worker_id=worker_id, **worker_kwargs)
+    try:
+        worker.iniciar()
+        _consumir_fila_fundos(worker, fila_fundos, fila_resultados)
+    finally:
+        worker.fechar()
+
+
+def _fundo_do_arquivo(nome_lower: str, re_padroes: re.Pattern,
+                      mapa_padroes: Dict[str, int]) -> Optional[int]:
+    """
+    Indice do fundo dono do arquivo: entre os padroes contidos no nome, o do
+    primeiro fundo da lista (mesma regra do loop original, que parava no
+    primeiro fundo cujo padrao aparecia no nome). None se nenhum aparece.
+    """
+    indices = [mapa_padroes[m.group(1)] for m in re_padroes.finditer(nome_lower)]
+    return min(indices) if indices else None
+
+
+def _extrair_e_rotear(zip_path: str, extract_dir: str, extension: str,
+                      re_padroes: re.Pattern, mapa_padroes: Dict[str, int],
+                      remover: bool = True) -> List[Tuple[str, int]]:
+    """
+    Extrai de um ZIP apenas os arquivos de algum fundo (padrao no nome, via
+    regex unica + lookup em mapa_padroes), em stream com buffer de 1 MiB.
+    Roda em processo separado (so argumentos picklaveis); os moves ficam com o
+    processo pai. Retorna [(caminho extraido, indice do fundo)].
+    remover=False mantem o ZIP (quem chama apaga quando for seguro).
+    """
+    os.makedirs(extract_dir, exist_ok=True)
+    rotas = []
+    # Buffer de 1 MiB: o diretorio central (fim do arquivo) e os membros sao
+    # lidos em poucas chamadas read() em vez de muitas leituras pequenas
+    with open(zip_path, 'rb', buffering=1 << 20) as fh, zipfile.ZipFile(fh, 'r') as zf:
+        for info in zf.infolist():
+            nome = info.filename
+            # Apenas arquivos na raiz do ZIP, da extensao do relatorio
+            # (basename tambem barra contrabarra e 'C:x' no Windows)
+            if (info.is_dir() or os.path.basename(nome) != nome
+                    or not nome.endswith(extension)):
+                continue
+            indice = _fundo_do_arquivo(nome.lower(), re_padroes, mapa_padroes)
+            if indice is None:
+                continue
+
+            destino = os.path.join(extract_dir, nome)
+            with zf.open(info) as src, open(destino, 'wb') as out:
+                shutil.copyfileobj(src, out, 1 << 20)
+            rotas.append((destino, indice))
+    if remover:
+        os.remove(zip_path)
+    return rotas
+
 
 # =============================================================================
 # CLASSE PRINCIPAL: QoreAutomation
@@ -1129,6 +1791,11 @@ class QoreAutomation:
     Orquestra login, navegacao e downloads.
     """
 
+    # FASE 2 com workers em processos (spawn) em vez de threads. Desligado:
+    # cada processo reimporta o modulo e sobe Chrome proprio; ligar apenas
+    # em maquinas onde o GIL do orquestrador for o gargalo
+    WORKERS_EM_PROCESSOS = False
+
     def __init__(self, paths: QorePaths, credentials: QoreCredentials,
                  flags: QoreFlags, datas: QoreDatas):
         self.paths = paths
@@ -1144,29 +1811,12 @@ class QoreAutomation:
         # Estatisticas
         self.stats = {'total': 0, 'sucesso': 0, 'erro': 0}
 
+        # ZIPs entregues pelos workers durante a FASE 2 (ver _consumir_zips)
+        self._fila_zips: Optional[queue.Queue] = None
+
         # Configuracoes de retry
         self.timeouts = Timeouts()
 
-    def _executar_com_retry(self, func, descricao: str, *args, **kwargs):
-        """
-        Executa uma funcao com retry e backoff exponencial.
-        Retorna o resultado da funcao ou None em caso de falha total.
-        """
-        max_retries = self.timeouts.MAX_RETRIES
-
-        for attempt in range(max_retries + 1):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt  # 1s, 2s, 4s...
-                    log.warning(f"{descricao}: tentativa {attempt + 1} falhou, "
-                               f"retry em {wait_time}s... ({e})")
-                    time.sleep(wait_time)
-                else:
-                    log.error(f"{descricao}: falha apos {max_retries + 1} tentativas - {e}")
-                    raise
-
     def executar(self):
         """Executa a rotina completa de automacao V14 - Multidriver."""
         self._print_header()
@@ -1199,31 +1849,35 @@ class QoreAutomation:
             self._print_resumo()
 
     def _print_header(self):
-        """Imprime cabecalho da execucao."""
-        print()
-        print("=" * 70)
-        print("  AUTOMACAO QORE V14 - MULTIDRIVER PARALELO")
-        print("=" * 70)
-        print()
-
-        log.info(f"Data referencia: {self.datas.data_exibicao}")
-        log.info(f"Workers: {self.timeouts.NUM_WORKERS} Chromes simultaneos")
-        log.info(f"Tipos: PDF={self.flags.pdf_enabled} | "
-                f"Excel={self.flags.excel_enabled} | "
-                f"XML={self.flags.xml_enabled}")
+        """Imprime cabecalho da execucao (uma unica escrita no stdout)."""
+        sys.stdout.write(
+            "\n" + "=" * 70 + "\n"
+            "  AUTOMACAO QORE V14 - MULTIDRIVER PARALELO\n"
+            + "=" * 70 + "\n\n"
+        )
+        sys.stdout.flush()
+
+        log.info(
+            f"Data referencia: {self.datas.data_exibicao}\n"
+            f"Workers: {self.timeouts.NUM_WORKERS} Chromes simultaneos\n"
+            f"Tipos: PDF={self.flags.pdf_enabled} | "
+            f"Excel={self.flags.excel_enabled} | "
+            f"XML={self.flags.xml_enabled}"
+        )
         print()
 
     def _print_resumo(self):
-        """Imprime resumo da execucao."""
-        print()
-        print("-" * 70)
-        print("  RESUMO")
-        print("-" * 70)
-        print(f"    Total de fundos:     {self.stats['total']}")
-        print(f"    Processados:         {self.stats['sucesso']}")
-        print(f"    Com erro:            {self.stats['erro']}")
-        print("=" * 70)
-        print()
+        """Imprime resumo da execucao (uma unica escrita no stdout)."""
+        sys.stdout.write(
+            "\n" + "-" * 70 + "\n"
+            "  RESUMO\n"
+            + "-" * 70 + "\n"
+            f"    Total de fundos:     {self.stats['total']}\n"
+            f"    Processados:         {self.stats['sucesso']}\n"
+            f"    Com erro:            {self.stats['erro']}\n"
+            + "=" * 70 + "\n\n"
+        )
+        sys.stdout.flush()
 
     def _fazer_login(self) -> bool:
         """Realiza login no portal QORE com retry automatico."""
@@ -1236,6 +1890,19 @@ class QoreAutomation:
                 if not self.selenium.navegar(self.credentials.url):
                     raise Exception("Falha ao navegar para URL")
 
+                # Perfil persistente (--user-data-dir) pode manter a sessao:
+                # o portal redireciona direto ao dashboard, sem formulario
+                try:
+                    WebDriverWait(self.selenium.driver, self.timeouts.PAGE_LOAD).until(
+                        lambda d: 'dashboard' in d.current_url.lower()
+                        or d.find_elements(By.NAME, 'email')
+                    )
+                except TimeoutException:
+                    pass
+                if 'dashboard' in self.selenium.driver.current_url.lower():
+                    log.info("Sessao do perfil ainda ativa, login dispensado")
+                    return True
+
                 log.info("Inserindo credenciais...")
 
                 # Email
@@ -1259,8 +1926,8 @@ class QoreAutomation:
 
             except Exception as e:
                 if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    log.warning(f"Login: tentativa {attempt + 1} falhou, retry em {wait_time}s... ({e})")
+                    wait_time = _backoff(attempt)
+                    log.warning(f"Login: tentativa {attempt + 1} falhou, retry em {wait_time:.1f}s... ({e})")
                     time.sleep(wait_time)
                 else:
                     log.error(f"Login: falha apos {max_retries + 1} tentativas")
@@ -1269,6 +1936,21 @@ class QoreAutomation:
 
         return False
 
+    # Varredura dos links do dashboard: {sigla: href} do primeiro <a> (ordem
+    # do documento) cujo texto visivel contem a sigla, como PARTIAL_LINK_TEXT
+    _JS_LINKS_FUNDOS = """
+        var siglas = arguments[0], out = {}, faltam = siglas.length;
+        var links = document.querySelectorAll('a[href]');
+        for (var i = 0; i < links.length && faltam > 0; i++) {
+            var texto = links[i].innerText || links[i].textContent || '';
+            for (var j = 0; j < siglas.length; j++) {
+                var s = siglas[j];
+                if (!(s in out) && texto.indexOf(s) !== -1) { out[s] = links[i].href; faltam--; }
+            }
+        }
+        return out;
+    """
+
     def _processar_fundos_v14(self):
         """
         V14: Processa fundos com MULTIPLOS DRIVERS Chrome em paralelo.
@@ -1303,19 +1985,34 @@ class QoreAutomation:
         self.selenium.navegar(self.credentials.url)
         self.selenium.aguardar_carregamento()
 
-        # Coleta URLs
+        # Coleta URLs: uma varredura JS dos links do dashboard resolve todas as
+        # siglas num round-trip; so as que faltarem vao ao lookup com wait
+        siglas = [self.fundo_manager.get_sigla(nome) for nome, _ in fundos]
+        try:
+            hrefs = self.selenium.driver.execute_script(self._JS_LINKS_FUNDOS, siglas) or {}
+        except Exception as e:
+            log.debug(f"Varredura JS dos links falhou: {e}")
+            hrefs = {}
+
         fundos_urls = []
-        for nome_fundo, pasta_fundo in fundos:
-            sigla = self.fundo_manager.get_sigla(nome_fundo)
+        for (nome_fundo, pasta_fundo), sigla in zip(fundos, siglas):
             try:
-                elemento = self.selenium.encontrar_elemento(By.PARTIAL_LINK_TEXT, sigla)
-                if elemento:
-                    url = elemento.get_attribute('href')
+                url = hrefs.get(sigla)
+                if not url:
+                    elemento = self.selenium.encontrar_elemento(By.PARTIAL_LINK_TEXT, sigla)
+                    url = elemento.get_attribute('href') if elemento else None
+                if url:
+                    # Padrao de casamento com os arquivos do ZIP, ja minusculo
+                    is_bloko = self.fundo_manager.is_bloko(nome_fundo)
+                    padrao = (self.fundo_manager.get_bloko_pattern(nome_fundo)
+                              if is_bloko else sigla)
                     fundos_urls.append({
                         'nome': nome_fundo,
                         'sigla': sigla,
                         'url': url,
-                        'pasta': pasta_fundo
+                        'pasta': pasta_fundo,
+                        'is_bloko': is_bloko,
+                        'padrao_lower': padrao.lower()
                     })
                     log.info(f"  URL: {sigla}")
                 else:
@@ -1327,71 +2024,83 @@ class QoreAutomation:
 
         log.info(f"Total URLs coletadas: {len(fundos_urls)}")
 
-        # Fecha driver principal (nao precisa mais)
-        self.selenium.fechar()
-        log.info("Driver principal fechado - workers farao login proprio")
+        # Sessao logada (cookies + localStorage): workers reaproveitam em vez
+        # de logar
+        try:
+            cookies = self.selenium.driver.execute_cdp_cmd(
+                'Network.getAllCookies', {}
+            )['cookies']
+        except Exception as e:
+            log.warning(f"Nao foi possivel exportar cookies da sessao: {e}")
+            cookies = None
+        try:
+            local_storage = self.selenium.driver.execute_script(
+                "return [location.origin, JSON.stringify(window.localStorage)];"
+            )
+        except Exception:
+            local_storage = None
+
+        # Driver principal segue aberto: vira o worker 0 (ja logado)
 
         # =====================================================================
         # FASE 2: Processa fundos com multiplos workers
         # =====================================================================
         print()
         log.info("=" * 50)
-        log.info(f"FASE 2: Iniciando {self.timeouts.NUM_WORKERS} workers (cada um faz login)...")
+        log.info(f"FASE 2: Iniciando {self.timeouts.NUM_WORKERS} workers (sessao reaproveitada)...")
         log.info("=" * 50)
 
-        resultados = []
-
-        def worker_task(fundo_info: dict) -> dict:
-            """Tarefa executada por cada worker."""
-            worker_id = threading.current_thread().name[-1]
+        num_workers = max(1, min(self.timeouts.NUM_WORKERS, len(fundos_urls)))
+        worker_kwargs = {
+            'base_temp_path': self.paths.temp_download,
+            'credentials': self.credentials,
+            'datas': self.datas,
+            'report_config': report_config,
+            'cookies': cookies,
+            'local_storage': local_storage,
+        }
 
-            # Cria worker Chrome com credenciais (fara login proprio)
-            worker = WorkerChrome(
-                worker_id=int(worker_id) if worker_id.isdigit() else 0,
-                base_temp_path=self.paths.temp_download,
-                credentials=self.credentials,
-                datas=self.datas,
-                report_config=report_config
-            )
+        # Produtor-consumidor: fila unica de fundos; cada worker consome ate
+        # achar o sentinela (None). Fundo lento nao segura os demais.
+        # Com >4 nucleos os workers rodam em processos (sem disputa do GIL
+        # na parte Python); senao, ou se os processos nao subirem, em threads
+        # FASE 3 sobreposta a FASE 2: cada ZIP entregue por um worker ja e
+        # extraido e roteado por um consumidor enquanto os demais baixam
+        self._fila_zips = queue.Queue()
+        zips_processados: List[str] = []
+        consumidor = threading.Thread(
+            target=self._consumir_zips,
+            args=(self._fila_zips, zips_processados, tipo_download, report_config, fundos_urls),
+            name='qore-zips', daemon=True
+        )
+        consumidor.start()
 
+        # Estatisticas atualizadas a cada resultado (_registrar_resultado)
+        em_processos = False
+        if (self.WORKERS_EM_PROCESSOS and num_workers > 1
+                and (os.cpu_count() or 1) > 4):
             try:
-                if worker.iniciar():
-                    result = worker.processar_fundo(
-                        fundo_info['url'],
-                        fundo_info['sigla'],
-                        fundo_info['nome']
-                    )
-                else:
-                    result = {
-                        'nome': fundo_info['nome'],
-                        'sigla': fundo_info['sigla'],
-                        'status': 'erro'
-                    }
-            finally:
-                worker.fechar()
-
-            return result
-
-        # Executa com ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=self.timeouts.NUM_WORKERS) as executor:
-            futures = {
-                executor.submit(worker_task, fundo): fundo
-                for fundo in fundos_urls
-            }
+                self._executar_workers_processos(fundos_urls, num_workers, worker_kwargs)
+                em_processos = True
+            except Exception as e:
+                log.warning(f"Workers em processos indisponiveis, usando threads: {e}")
 
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    resultados.append(result)
+        if not em_processos:
+            self._executar_workers_threads(fundos_urls, num_workers, worker_kwargs)
 
-                    if result['status'] == 'sucesso':
-                        self.stats['sucesso'] += 1
-                    else:
-                        self.stats['erro'] += 1
+        # Fecha driver principal (nao precisa mais)
+        self.selenium.fechar()
 
-                except Exception as e:
-                    log.error(f"Worker falhou: {e}")
-                    self.stats['erro'] += 1
+        # Termina os ZIPs ja entregues; so entao e seguro apaga-los (durante a
+        # FASE 2 os workers contam os ZIPs da pasta para detectar o download)
+        self._fila_zips.put(None)
+        consumidor.join()
+        self._fila_zips = None
+        for zip_path in zips_processados:
+            try:
+                os.remove(zip_path)
+            except OSError:
+                pass
 
         # =====================================================================
         # FASE 3: Processa arquivos baixados (de todas as pastas dos workers)
@@ -1401,721 +2110,300 @@ class QoreAutomation:
         log.info("FASE 3: Processando arquivos...")
         log.info("=" * 50)
 
-        # Busca ZIPs em todas as pastas dos workers (worker_0, worker_1, ...)
-        zips = list(Path(self.paths.temp_download).glob('**/*.zip'))
-        log.info(f"ZIPs encontrados: {len(zips)}")
-
-        for zip_file in zips:
-            self._processar_zip_v14(zip_file, tipo_download, fundos_urls)
-
-        # Limpa pastas dos workers
-        for worker_dir in Path(self.paths.temp_download).glob('worker_*'):
+        # Busca ZIPs so onde eles caem: raiz da pasta temp, pastas dos
+        # workers (worker_0, ...) e as que estao em RAM. Sem varredura
+        # recursiva (extract_* e sobras de execucoes anteriores ficam de fora)
+        temp_base = Path(self.paths.temp_download)
+        pastas_ram = [
+            Path(_pasta_worker_ram(self.paths.temp_download, i)) for i in range(num_workers)
+        ]
+        pastas_ram = [p for p in pastas_ram if p.is_dir()]
+        zips = []
+        for pasta in [temp_base, *temp_base.glob('worker_*'), *pastas_ram]:
             try:
-                shutil.rmtree(worker_dir, ignore_errors=True)
-            except Exception:
-                pass
-
-    def _processar_zip_v14(self, zip_file: Path, report_type: str, fundos_urls: list):
-        """Processa um ZIP baixado."""
-        config = REPORT_CONFIGS.get(report_type.upper())
-        if not config:
-            return
-
-        temp_extract = Path(self.file_handler.temp_path) / f'extract_{zip_file.stem}'
-        temp_extract.mkdir(exist_ok=True)
-
-        try:
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(temp_extract)
-
-            zip_file.unlink()
-
-            for arquivo in temp_extract.glob(f'*{config.extension}'):
-                nome_arquivo = arquivo.name.lower()
-
-                for fundo_info in fundos_urls:
-                    sigla = fundo_info['sigla'].lower()
-                    nome_fundo = fundo_info['nome']
-                    pasta = fundo_info.get('pasta', '')
-
-                    if self.fundo_manager.is_bloko(nome_fundo):
-                        padrao = self.fundo_manager.get_bloko_pattern(nome_fundo).lower()
-                    else:
-                        padrao = sigla
-
-                    if padrao and padrao in nome_arquivo:
-                        data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
-                        if not data_arquivo:
-                            data_arquivo = self.datas.data_final
-
-                        self.file_handler._mover_arquivo(
-                            arquivo, nome_fundo, data_arquivo, report_type, pasta
-                        )
-                        log.info(f"  Arquivo movido: {arquivo.name}")
-                        break
-
-        finally:
-            if temp_extract.exists():
-                shutil.rmtree(temp_extract, ignore_errors=True)
-
-    def _processar_fundos(self):
+                with os.scandir(pasta) as entries:
+                    zips.extend(Path(e.path) for e in entries
+                                if e.name.endswith('.zip') and e.is_file())
+            except OSError:
+                pass  # pasta sumiu (limpeza em andamento) ou nao e diretorio
+        log.info(f"ZIPs processados durante a FASE 2: {len(zips_processados)} | "
+                 f"restantes: {len(zips)}")
+
+        self._processar_zips_v14(zips, tipo_download, report_config, fundos_urls)
+
+        # Limpa pastas dos workers fora do caminho critico: renomeia (rapido,
+        # libera o nome para a proxima execucao) e apaga numa thread. Nao e
+        # daemon: o interpretador espera a limpeza antes de sair (as pastas
+        # em RAM nao sao pegas pelo limpar_temp da proxima execucao)
+        lixo = []
+        sufixo = f'.lixo_{time.time_ns()}'
+        for worker_dir in list(Path(self.paths.temp_download).glob('worker_*')) + pastas_ram:
+            try:
+                lixo.append(worker_dir.rename(worker_dir.with_name(worker_dir.name + sufixo)))
+            except OSError:
+                lixo.append(worker_dir)
+        if lixo:
+            threading.Thread(
+                target=lambda: [shutil.rmtree(d, ignore_errors=True) for d in lixo],
+                name='qore-limpeza'
+            ).start()
+
+    def _registrar_resultado(self, result: dict):
         """
-        DEPRECADO - Mantido para compatibilidade.
-        Processa todos os fundos em PARALELO usando multiplas abas.
-        Estrategia VERDADEIRAMENTE PARALELA:
-        1. Coleta links de todos os fundos no dashboard
-        2. Abre TODAS as guias de uma vez (29 guias)
-        3. Em CADA guia, inicia o download (sem fechar)
-        4. Aguarda TODOS os downloads completarem
-        5. Fecha todas as guias extras
-        6. Processa arquivos baixados
+        Contabiliza o resultado de um fundo assim que o worker entrega e passa
+        o ZIP baixado ao consumidor da FASE 3.
         """
-        fundos = list(self.fundo_manager.fundos.items())
-
-        # Determina qual tipo de relatorio baixar (prioridade: XML > Excel > PDF)
-        tipo_download = None
-        em_lote = False
-        if self.flags.xml_enabled:
-            tipo_download = 'XML'
-            em_lote = self.flags.xml_lote
-        elif self.flags.excel_enabled:
-            tipo_download = 'EXCEL'
-            em_lote = self.flags.excel_lote
-        elif self.flags.pdf_enabled:
-            tipo_download = 'PDF'
-            em_lote = self.flags.pdf_lote
-
-        if not tipo_download:
-            log.warning("Nenhum tipo de download habilitado")
-            return
-
-        config = REPORT_CONFIGS.get(tipo_download)
-
-        # Rastreia resultados e handles das abas
-        resultados: Dict[str, str] = {}
-        abas_fundos: Dict[str, dict] = {}  # {handle: {nome, sigla, pasta, url}}
-
-        # =====================================================================
-        # FASE 1: Coletar links dos fundos no dashboard
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info("FASE 1: Coletando links dos fundos...")
-        log.info("=" * 50)
-
-        self.selenium.navegar(self.credentials.url)
-        self.selenium.aguardar_carregamento()
-
-        links_fundos: Dict[str, dict] = {}
-
-        for nome_fundo, pasta_fundo in fundos:
-            sigla = self.fundo_manager.get_sigla(nome_fundo)
-            self.stats['total'] += 1
-
-            try:
-                elemento = self.selenium.encontrar_elemento(By.PARTIAL_LINK_TEXT, sigla)
-                if elemento:
-                    url = elemento.get_attribute('href')
-                    links_fundos[nome_fundo] = {
-                        'url': url,
-                        'sigla': sigla,
-                        'pasta': pasta_fundo
-                    }
-                    log.info(f"  Link encontrado: {sigla}")
-                else:
-                    log.warning(f"  {sigla} nao encontrado no dashboard")
-                    resultados[nome_fundo] = 'erro'
-            except Exception as e:
-                log.warning(f"  Erro ao buscar {sigla}: {e}")
-                resultados[nome_fundo] = 'erro'
-
-        log.info(f"Total de links coletados: {len(links_fundos)}")
-
-        # =====================================================================
-        # FASE 2: Abrir TODAS as guias de uma vez
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info("FASE 2: Abrindo TODAS as guias...")
-        log.info("=" * 50)
-
-        aba_principal = self.selenium.get_aba_principal()
-
-        for idx, (nome_fundo, info) in enumerate(links_fundos.items(), 1):
-            try:
-                # Abre nova guia
-                nova_aba = self.selenium.abrir_nova_aba()
-                self.selenium.trocar_para_aba(nova_aba)
-
-                # Navega para URL do fundo
-                self.selenium.driver.get(info['url'])
-
-                # Registra a aba
-                abas_fundos[nova_aba] = {
-                    'nome': nome_fundo,
-                    'sigla': info['sigla'],
-                    'pasta': info['pasta'],
-                    'status': 'aberta'
-                }
-
-                log.info(f"  [{idx}/{len(links_fundos)}] Aba aberta: {info['sigla']}")
-
-            except Exception as e:
-                log.error(f"  Erro ao abrir aba para {info['sigla']}: {e}")
-                resultados[nome_fundo] = 'erro'
-
-        log.info(f"Total de abas abertas: {len(abas_fundos)}")
-
-        # Volta para aba principal brevemente
-        self.selenium.trocar_para_aba(aba_principal)
-
-        # =====================================================================
-        # FASE 3: Iniciar downloads RAPIDO em TODAS as guias
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info("FASE 3: Disparando downloads (modo rapido)...")
-        log.info("=" * 50)
-
-        downloads_iniciados = 0
+        if result['status'] == 'sucesso':
+            self.stats['sucesso'] += 1
+            if self._fila_zips is not None and result.get('zip'):
+                self._fila_zips.put(result['zip'])
+        else:
+            self.stats['erro'] += 1
 
-        for idx, (handle, info) in enumerate(abas_fundos.items(), 1):
+    def _consumir_zips(self, fila_zips: queue.Queue, processados: List[str],
+                       report_type: str, config: ReportConfig, fundos_urls: list):
+        """
+        Consumidor da FASE 3 durante a FASE 2: extrai e roteia cada ZIP ao
+        chegar (ate o sentinela None). O ZIP fica no lugar e vai para
+        `processados`; o que falhar aqui a FASE 3 reprocessa.
+        """
+        padroes = self._mapa_padroes(fundos_urls)
+        while True:
+            zip_path = fila_zips.get()
+            if zip_path is None:
+                break
+            if not config or padroes is None:
+                continue
+            # Pasta unica: ZIPs de workers diferentes podem ter o mesmo nome
+            extract_dir = tempfile.mkdtemp(
+                prefix=f'extract_{Path(zip_path).stem}_', dir=self.file_handler.temp_path
+            )
             try:
-                self.selenium.trocar_para_aba(handle)
-
-                # Espera minima - apenas elemento clicavel
-                time.sleep(0.3)
-
-                log.info(f"  [{idx}/{len(abas_fundos)}] {info['sigla']}...")
-
-                # Clica no botao do tipo de relatorio (rapido)
-                if not self.selenium.clicar_elemento(
-                    By.XPATH, f"//button[contains(., '{config.button_text}')]"
-                ):
-                    log.warning(f"    Botao nao encontrado")
-                    info['status'] = 'erro'
-                    continue
-
-                time.sleep(0.3)
-
-                # Inicia download RAPIDO (sem esperas desnecessarias)
-                if em_lote and self._iniciar_download_rapido():
-                    log.info(f"    OK!")
-                    info['status'] = 'downloading'
-                    downloads_iniciados += 1
-                else:
-                    log.warning(f"    Falha")
-                    info['status'] = 'erro'
-
+                rotas = _extrair_e_rotear(
+                    zip_path, extract_dir, config.extension, *padroes, remover=False
+                )
             except Exception as e:
-                log.error(f"    Erro: {e}")
-                info['status'] = 'erro'
-
-        log.info(f"Downloads disparados: {downloads_iniciados}/{len(abas_fundos)}")
-
-        # =====================================================================
-        # FASE 4: Aguardar TODOS os downloads completarem
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info(f"FASE 4: Aguardando {downloads_iniciados} downloads...")
-        log.info("=" * 50)
-
-        # Aguarda downloads completarem (polling)
-        tempo_espera = max(downloads_iniciados * 3, 60)  # 3s por fundo, min 60s
-        log.info(f"Aguardando ate {tempo_espera}s para downloads completarem...")
-
-        for i in range(tempo_espera):
-            time.sleep(1)
-            # Verifica quantos ZIPs ja baixaram
-            zips_baixados = len(list(Path(self.file_handler.temp_path).glob('*.zip')))
-            if zips_baixados >= downloads_iniciados:
-                log.info(f"  Todos os {zips_baixados} ZIPs baixados!")
-                break
-            if i % 10 == 0 and i > 0:
-                log.info(f"  {i}s... {zips_baixados}/{downloads_iniciados} ZIPs")
-
-        # =====================================================================
-        # FASE 5: Fechar todas as guias extras
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info("FASE 5: Fechando guias...")
-        log.info("=" * 50)
-
-        self.selenium.fechar_todas_abas_extras()
-        log.info("  Todas as guias extras fechadas")
-
-        # =====================================================================
-        # FASE 6: Processar arquivos baixados
-        # =====================================================================
-        print()
-        log.info("=" * 50)
-        log.info("FASE 6: Processando arquivos...")
-        log.info("=" * 50)
-
-        # Lista todos os ZIPs
-        zips = list(Path(self.file_handler.temp_path).glob('*.zip'))
-        log.info(f"Encontrados {len(zips)} arquivos ZIP")
-
-        for zip_file in zips:
-            log.info(f"Extraindo: {zip_file.name}")
-            self._processar_zip_v13(zip_file, tipo_download, abas_fundos)
-
-        # =====================================================================
-        # Contabilizar resultados
-        # =====================================================================
-        for handle, info in abas_fundos.items():
-            if info['status'] in ['sucesso', 'downloading']:
-                self.stats['sucesso'] += 1
-            else:
-                self.stats['erro'] += 1
+                log.warning(f"Falha ao processar {Path(zip_path).name} (fica para a FASE 3): {e}")
+                shutil.rmtree(extract_dir, ignore_errors=True)
+                continue
+            self._mover_extraidos(rotas, extract_dir, report_type, config, fundos_urls)
+            processados.append(zip_path)
 
-        # Adiciona erros da fase de coleta de links
-        self.stats['erro'] += len(resultados)
+    def _mapa_padroes(self, fundos_urls: list) -> Optional[Tuple[re.Pattern, Dict[str, int]]]:
+        """
+        (regex unica dos padroes, padrao -> indice do fundo). Em padrao repetido
+        vence o primeiro fundo, como no loop original. None se nao ha padroes.
+        """
+        mapa_padroes: Dict[str, int] = {}
+        for indice, f in enumerate(fundos_urls):
+            padrao = f['padrao_lower']
+            if padrao:
+                mapa_padroes.setdefault(padrao, indice)
+        if not mapa_padroes:
+            return None
 
-    def _processar_zip_v13(self, zip_file: Path, report_type: str,
-                          abas_fundos: dict):
-        """Processa um ZIP baixado, distribuindo arquivos para os fundos."""
-        config = REPORT_CONFIGS.get(report_type.upper())
-        if not config:
-            return
+        # Lookahead (largura zero): finditer testa todas as posicoes, inclusive
+        # ocorrencias sobrepostas; alternativas na ordem dos fundos, entao em
+        # cada posicao o grupo e o padrao do menor indice (ver _fundo_do_arquivo)
+        re_padroes = re.compile('(?=(' + '|'.join(
+            re.escape(p) for p in mapa_padroes
+        ) + '))')
+        return re_padroes, mapa_padroes
 
-        temp_extract = Path(self.file_handler.temp_path) / f'extract_{zip_file.stem}'
-        temp_extract.mkdir(exist_ok=True)
+    def _executar_workers_threads(self, fundos_urls: list, num_workers: int,
+                                  worker_kwargs: dict):
+        """
+        FASE 2 com workers em threads (um Chrome por thread). O worker 0 usa o
+        driver principal, ja logado.
+        """
+        workers = [WorkerChrome(worker_id=i, **worker_kwargs) for i in range(num_workers)]
 
+        # Warmup: logins em paralelo (I/O-bound)
+        def preparar(worker: WorkerChrome) -> bool:
+            if worker.worker_id == 0 and worker.adotar(self.selenium.driver):
+                return True
+            return worker.iniciar()
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            iniciados = list(executor.map(preparar, workers))
+        log.info(f"Workers logados: {sum(iniciados)}/{num_workers}")
+
+        fila_fundos: queue.Queue = queue.Queue()
+        fila_resultados: queue.Queue = queue.Queue()
+        for fundo in fundos_urls:
+            fila_fundos.put(fundo)
+        for _ in workers:
+            fila_fundos.put(None)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for worker in workers:
+                executor.submit(_consumir_fila_fundos, worker, fila_fundos, fila_resultados)
+            for _ in fundos_urls:
+                self._registrar_resultado(fila_resultados.get())
+
+        # Encerra os workers em paralelo
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            list(executor.map(WorkerChrome.fechar, workers))
+
+    def _executar_workers_processos(self, fundos_urls: list, num_workers: int,
+                                    worker_kwargs: dict):
+        """
+        FASE 2 com workers em processos (spawn: seguro no Windows). O worker 0
+        roda numa thread deste processo com o driver principal (nao e picklavel).
+        So levanta excecao se nenhum processo ficou de pe (fallback seguro).
+        """
+        ctx = multiprocessing.get_context('spawn')
+        fila_fundos = ctx.Queue()
+        fila_resultados = ctx.Queue()
+        for fundo in fundos_urls:
+            fila_fundos.put(fundo)
+        for _ in range(num_workers):
+            fila_fundos.put(None)
+
+        processos = [
+            ctx.Process(
+                target=_worker_processo,
+                args=(i, worker_kwargs, fila_fundos, fila_resultados),
+                name=f'qore-worker-{i}', daemon=True
+            )
+            for i in range(1, num_workers)
+        ]
+        iniciados = []
         try:
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(temp_extract)
-
-            # Remove ZIP apos extrair
-            zip_file.unlink()
-
-            # Processa cada arquivo extraido
-            for arquivo in temp_extract.glob(f'*{config.extension}'):
-                nome_arquivo = arquivo.name.lower()
-
-                # Tenta identificar qual fundo este arquivo pertence
-                # Usa abas_fundos que tem {handle: {nome, sigla, pasta, status}}
-                for _, info in abas_fundos.items():
-                    sigla = info['sigla'].lower()
-                    nome_fundo = info['nome']
-                    pasta = info.get('pasta', '')
-
-                    # Verifica se arquivo pertence a este fundo
-                    if self.fundo_manager.is_bloko(nome_fundo):
-                        padrao = self.fundo_manager.get_bloko_pattern(nome_fundo).lower()
-                    else:
-                        padrao = sigla
-
-                    if padrao and padrao in nome_arquivo:
-                        # Extrai data do arquivo
-                        data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
-                        if not data_arquivo:
-                            data_arquivo = self.datas.data_final
-
-                        # Move para destino
-                        if self.file_handler._mover_arquivo(
-                            arquivo, nome_fundo, data_arquivo, report_type, pasta
-                        ):
-                            info['status'] = 'sucesso'
-                        break
-
-        finally:
-            if temp_extract.exists():
-                shutil.rmtree(temp_extract, ignore_errors=True)
+            for processo in processos:
+                processo.start()
+                iniciados.append(processo)
+        except Exception:
+            # O chamador cai para threads: derruba antes os que ja subiram,
+            # senao dois workers disputariam os mesmos fundos
+            for processo in iniciados:
+                processo.terminate()
+            for processo in iniciados:
+                processo.join(timeout=30)
+            raise
+        log.info(f"{len(processos)} workers iniciados em processos")
 
-    def _iniciar_download_lote(self) -> bool:
-        """Inicia download em lote na aba atual."""
+        # Daqui em diante nao propaga excecao: com processos ja consumindo a
+        # fila, o fallback para threads duplicaria fundos
+        thread_principal = None
+        pendentes = {f['nome']: f for f in fundos_urls}
         try:
-            # Clica no menu de opcoes (...)
-            menus = self.selenium.encontrar_elementos(
-                By.XPATH, '//div[@data-kt-menu-trigger="click"]'
+            worker_principal = WorkerChrome(worker_id=0, **worker_kwargs)
+
+            def consumir_principal():
+                try:
+                    # Sem o driver principal sobe Chrome proprio (se falhar, o
+                    # consumo tenta de novo via garantir_sessao)
+                    if not worker_principal.adotar(self.selenium.driver):
+                        worker_principal.iniciar()
+                    _consumir_fila_fundos(worker_principal, fila_fundos, fila_resultados)
+                finally:
+                    worker_principal.fechar()
+
+            thread_principal = threading.Thread(
+                target=consumir_principal, name='qore-worker-0', daemon=True
             )
+            thread_principal.start()
 
-            for menu in menus:
+            while pendentes:
                 try:
-                    icone = menu.find_element(By.TAG_NAME, 'i')
-                    if 'ellipsis' in icone.get_attribute('class'):
-                        menu.click()
+                    result = fila_resultados.get(timeout=1)
+                except queue.Empty:
+                    # Todos os workers morreram sem entregar: encerra
+                    if not thread_principal.is_alive() and not any(p.is_alive() for p in processos):
                         break
-                except Exception:
                     continue
-
-            self.selenium.aguardar_elemento_visivel(
-                By.XPATH, '//a[contains(., "Download em Lote")]'
-            )
-
-            # Clica em "Download em Lote"
-            if not self.selenium.clicar_elemento(
-                By.XPATH, '//a[contains(., "Download em Lote")]'
-            ):
-                return False
-
-            self.selenium.aguardar_elemento_visivel(By.ID, 'dataInicial')
-
-            # Preenche datas
-            self.selenium.preencher_data_js('dataInicial', self.datas.data_inicial)
-            self.selenium.preencher_data_js('dataFinal', self.datas.data_final)
-
-            self.selenium.aguardar_breve()
-
-            # Clica em Download
-            if not self.selenium.clicar_elemento(
-                By.XPATH, '//button[contains(., "Download")]'
-            ):
-                return False
-
-            return True
-
-        except Exception as e:
-            log.error(f"Erro ao iniciar download em lote: {e}")
-            return False
-
-    def _iniciar_download_rapido(self) -> bool:
-        """
-        Versao RAPIDA do download em lote - sem esperas desnecessarias.
-        Usado no modo paralelo para disparar downloads rapidamente.
-        """
-        try:
-            # Clica no menu de opcoes (...) usando JavaScript (mais rapido)
-            self.selenium.driver.execute_script("""
-                var menus = document.querySelectorAll('[data-kt-menu-trigger="click"]');
-                for (var i = 0; i < menus.length; i++) {
-                    var icone = menus[i].querySelector('i');
-                    if (icone && icone.className.includes('ellipsis')) {
-                        menus[i].click();
-                        break;
-                    }
-                }
-            """)
-
-            time.sleep(0.2)
-
-            # Clica em "Download em Lote" usando JavaScript
-            self.selenium.driver.execute_script("""
-                var links = document.querySelectorAll('a');
-                for (var i = 0; i < links.length; i++) {
-                    if (links[i].textContent.includes('Download em Lote')) {
-                        links[i].click();
-                        break;
-                    }
-                }
-            """)
-
-            time.sleep(0.3)
-
-            # Preenche datas usando JavaScript (mais rapido)
-            self.selenium.driver.execute_script(f"""
-                var dataIni = document.getElementById('dataInicial');
-                var dataFim = document.getElementById('dataFinal');
-                if (dataIni) {{ dataIni.value = '{self.datas.data_inicial}'; }}
-                if (dataFim) {{ dataFim.value = '{self.datas.data_final}'; }}
-            """)
-
-            time.sleep(0.2)
-
-            # Clica em Download usando JavaScript
-            self.selenium.driver.execute_script("""
-                var botoes = document.querySelectorAll('button');
-                for (var i = 0; i < botoes.length; i++) {
-                    if (botoes[i].textContent.includes('Download')) {
-                        botoes[i].click();
-                        break;
-                    }
-                }
-            """)
-
-            return True
-
+                if pendentes.pop(result['nome'], None) is not None:
+                    self._registrar_resultado(result)
         except Exception as e:
-            log.error(f"Erro download rapido: {e}")
-            return False
-
-    def _processar_zip_paralelo(self, zip_file: Path, report_type: str,
-                                abas_fundos: dict):
-        """Processa um ZIP baixado, distribuindo arquivos para os fundos."""
-        config = REPORT_CONFIGS.get(report_type.upper())
-        if not config:
-            return
-
-        temp_extract = Path(self.file_handler.temp_path) / f'extract_{zip_file.stem}'
-        temp_extract.mkdir(exist_ok=True)
-
-        try:
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(temp_extract)
-
-            # Remove ZIP apos extrair
-            zip_file.unlink()
-
-            # Processa cada arquivo extraido
-            for arquivo in temp_extract.glob(f'*{config.extension}'):
-                # Tenta identificar qual fundo este arquivo pertence
-                nome_arquivo = arquivo.name.lower()
-
-                for _, info in abas_fundos.items():
-                    if info['status'] == 'erro':
-                        continue
-
-                    sigla = info['sigla'].lower()
-                    nome = info['nome']
-                    pasta = info.get('pasta', '')
-
-                    # Verifica se arquivo pertence a este fundo
-                    if self.fundo_manager.is_bloko(nome):
-                        padrao = self.fundo_manager.get_bloko_pattern(nome).lower()
-                    else:
-                        padrao = sigla
-
-                    if padrao and padrao in nome_arquivo:
-                        # Extrai data do arquivo
-                        data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
-                        if not data_arquivo:
-                            data_arquivo = self.datas.data_final
-
-                        # Move para destino
-                        if self.file_handler._mover_arquivo(
-                            arquivo, nome, data_arquivo, report_type, pasta
-                        ):
-                            info['status'] = 'sucesso'
-                        break
-
+            log.error(f"Erro coordenando workers em processos: {e}")
         finally:
-            if temp_extract.exists():
-                shutil.rmtree(temp_extract, ignore_errors=True)
-
-    def _processar_fundo_com_retry(self, nome_fundo: str, sigla: str) -> bool:
-        """Processa um fundo com retry automatico."""
-        max_retries = self.timeouts.MAX_RETRIES
-
-        for attempt in range(max_retries + 1):
-            try:
-                return self._processar_fundo_interno(nome_fundo, sigla)
-
-            except Exception as e:
-                if attempt < max_retries:
-                    wait_time = 2 ** attempt
-                    log.warning(f"Fundo {nome_fundo}: tentativa {attempt + 1} falhou, "
-                               f"retry em {wait_time}s... ({e})")
-                    time.sleep(wait_time)
-                else:
-                    log.error(f"Fundo {nome_fundo}: falha apos {max_retries + 1} tentativas - {e}")
-                    return False
-
-        return False
-
-    def _sessao_valida(self) -> bool:
-        """Verifica se a sessao ainda esta ativa (nao expirou)."""
-        try:
-            url_atual = self.selenium.driver.current_url.lower()
-            # Se esta na pagina de login, sessao expirou
-            return 'login' not in url_atual and 'signin' not in url_atual
-        except Exception:
-            return False
-
-    def _verificar_e_recuperar_sessao(self) -> bool:
-        """Verifica sessao e faz re-login se necessario."""
-        if self._sessao_valida():
-            return True
-
-        log.warning("Sessao expirada, refazendo login...")
-        return self._fazer_login()
-
-    def _processar_fundo_interno(self, nome_fundo: str, sigla: str) -> bool:
-        """Logica interna de processamento de um fundo."""
-        # Verifica/recupera sessao antes de processar
-        if not self._verificar_e_recuperar_sessao():
-            raise Exception("Falha ao recuperar sessao")
-
-        # Navega para dashboard
-        self.selenium.navegar(self.credentials.url)
-
-        # Clica no fundo
-        if not self.selenium.clicar_elemento(By.PARTIAL_LINK_TEXT, sigla):
-            raise Exception(f"Fundo {nome_fundo} nao encontrado no dashboard")
-
-        # Aguarda carregar pagina do fundo
-        self.selenium.aguardar_carregamento()
-
-        sucesso_fundo = False
-
-        # Processa cada tipo de relatorio
-        if self.flags.pdf_enabled:
-            if self._processar_tipo(nome_fundo, sigla, 'PDF', self.flags.pdf_lote):
-                sucesso_fundo = True
-
-        if self.flags.excel_enabled:
-            # Re-navega para estado limpo
-            self._renavegar_fundo(sigla)
-            if self._processar_tipo(nome_fundo, sigla, 'EXCEL', self.flags.excel_lote):
-                sucesso_fundo = True
-
-        if self.flags.xml_enabled:
-            self._renavegar_fundo(sigla)
-            if self._processar_tipo(nome_fundo, sigla, 'XML', self.flags.xml_lote):
-                sucesso_fundo = True
+            # Fundos sem resultado (processo caiu) contam como erro
+            for fundo in pendentes.values():
+                self._registrar_resultado(
+                    {'nome': fundo['nome'], 'sigla': fundo['sigla'], 'status': 'erro'}
+                )
 
-        return sucesso_fundo
+            if thread_principal is not None:
+                thread_principal.join(timeout=30)
+            for processo in processos:
+                processo.join(timeout=30)
+                if processo.is_alive():
+                    processo.terminate()
 
-    def _renavegar_fundo(self, sigla: str):
+    def _processar_zips_v14(self, zips: List[Path], report_type: str,
+                            config: ReportConfig, fundos_urls: list):
         """
-        Re-navega para pagina do fundo de forma otimizada.
-        Usa driver.back() quando possivel, evitando navegacao completa.
+        Processa os ZIPs baixados: extracao + casamento em processos paralelos
+        (zlib e CPU-bound), moves no processo pai, em serie.
         """
-        try:
-            # Tenta usar back() - muito mais rapido
-            self.selenium.driver.back()
-            self.selenium.aguardar_carregamento()
-
-            # Verifica se voltou para pagina do fundo (tem os botoes de relatorio)
-            botoes = self.selenium.encontrar_elementos(
-                By.XPATH, "//button[contains(., 'Carteira')]"
-            )
-            if botoes:
-                return  # Sucesso - ja esta na pagina do fundo
-
-        except Exception:
-            pass
-
-        # Fallback: navegacao completa (mais lenta, mas garantida)
-        self.selenium.navegar(self.credentials.url)
-        self.selenium.clicar_elemento(By.PARTIAL_LINK_TEXT, sigla)
-        self.selenium.aguardar_carregamento()
-
-    def _processar_tipo(self, fundo_nome: str, sigla: str,
-                       report_type: str, em_lote: bool) -> bool:
-        """Processa download de um tipo de relatorio."""
-        config = REPORT_CONFIGS.get(report_type)
-        if not config:
-            return False
-
-        log.info(f"  Baixando {report_type}...")
-
-        # Clica no botao do tipo de relatorio
-        if not self.selenium.clicar_elemento(
-            By.XPATH, f"//button[contains(., '{config.button_text}')]"
-        ):
-            log.warning(f"  Botao '{config.button_text}' nao encontrado")
-            return False
-
-        self.selenium.aguardar_carregamento()
-
-        if em_lote:
-            return self._download_lote(fundo_nome, report_type, config)
-        else:
-            return self._download_individual(fundo_nome, sigla, report_type, config)
-
-    def _download_individual(self, fundo_nome: str, sigla: str,
-                            report_type: str, config: ReportConfig) -> bool:
-        """Download de arquivo individual (modo nao-lote)."""
-        data_busca = self.datas.data_exibicao
+        if not config or not zips:
+            return
 
-        # Procura na tabela
-        rows = self.selenium.encontrar_elementos(By.XPATH, '//tbody/tr')
+        padroes = self._mapa_padroes(fundos_urls)
+        if padroes is None:
+            return
+        re_padroes, mapa_padroes = padroes
+        # zip -> pasta de extracao (unica: ZIPs de workers diferentes podem
+        # ter o mesmo nome); o que sobrar aqui roda em serie
+        restantes = {
+            str(z): tempfile.mkdtemp(prefix=f'extract_{z.stem}_',
+                                     dir=self.file_handler.temp_path)
+            for z in zips
+        }
 
-        for row in rows:
+        num_processos = min(len(zips), os.cpu_count() or 1)
+        if num_processos > 1:
             try:
-                texto = row.text
-                if data_busca in texto:
-                    # Encontrou a linha, clica no botao de download
-                    btn = row.find_element(By.TAG_NAME, 'button')
-                    btn.click()
-
-                    log.info(f"  Download iniciado para {data_busca}")
-
-                    # Aguarda arquivo
-                    arquivo = self.file_handler.aguardar_download(
-                        config.extension, sigla
-                    )
-
-                    if arquivo:
-                        pasta_fundo = self.fundo_manager.fundos.get(fundo_nome, '')
-                        return self.file_handler.processar_arquivo_individual(
-                            arquivo, fundo_nome, self.datas.data_inicial,
-                            report_type, pasta_fundo
+                with ProcessPoolExecutor(max_workers=num_processos) as executor:
+                    futures = {
+                        executor.submit(_extrair_e_rotear, zip_path, extract_dir,
+                                        config.extension, re_padroes,
+                                        mapa_padroes): zip_path
+                        for zip_path, extract_dir in restantes.items()
+                    }
+                    for future in as_completed(futures):
+                        zip_path = futures[future]
+                        try:
+                            rotas = future.result()
+                        except Exception as e:
+                            log.warning(f"Extracao paralela falhou ({Path(zip_path).name}): {e}")
+                            continue
+                        self._mover_extraidos(
+                            rotas, restantes.pop(zip_path), report_type, config, fundos_urls
                         )
-                    else:
-                        log.warning("  Timeout aguardando download")
-                        return False
+            except Exception as e:
+                log.warning(f"Extracao em processos indisponivel, seguindo em serie: {e}")
 
-            except Exception:
+        for zip_path, extract_dir in restantes.items():
+            try:
+                rotas = _extrair_e_rotear(
+                    zip_path, extract_dir, config.extension, re_padroes, mapa_padroes
+                )
+            except Exception as e:
+                log.error(f"Falha ao processar {Path(zip_path).name}: {e}")
+                shutil.rmtree(extract_dir, ignore_errors=True)
                 continue
+            self._mover_extraidos(rotas, extract_dir, report_type, config, fundos_urls)
 
-        log.warning(f"  Data {data_busca} nao encontrada na tabela")
-        return False
-
-    def _download_lote(self, fundo_nome: str, report_type: str,
-                      config: ReportConfig) -> bool:
-        """Download em lote (ZIP)."""
+    def _mover_extraidos(self, rotas: List[Tuple[str, int]], extract_dir: str,
+                         report_type: str, config: ReportConfig, fundos_urls: list):
+        """Move os arquivos extraidos de um ZIP e remove a pasta de extracao."""
         try:
-            # Clica no menu de opcoes (...)
-            menus = self.selenium.encontrar_elementos(
-                By.XPATH, '//div[@data-kt-menu-trigger="click"]'
-            )
-
-            for menu in menus:
-                try:
-                    icone = menu.find_element(By.TAG_NAME, 'i')
-                    if 'ellipsis' in icone.get_attribute('class'):
-                        menu.click()
-                        break
-                except Exception:
-                    continue
-
-            self.selenium.aguardar_elemento_visivel(By.XPATH, '//a[contains(., "Download em Lote")]')
-
-            # Clica em "Download em Lote"
-            if not self.selenium.clicar_elemento(
-                By.XPATH, '//a[contains(., "Download em Lote")]'
-            ):
-                log.warning("  Opcao 'Download em Lote' nao encontrada")
-                return False
-
-            self.selenium.aguardar_elemento_visivel(By.ID, 'dataInicial')
-
-            # Preenche datas
-            self.selenium.preencher_data_js('dataInicial', self.datas.data_inicial)
-            self.selenium.preencher_data_js('dataFinal', self.datas.data_final)
-
-            self.selenium.aguardar_breve()
-
-            # Clica em Download
-            if not self.selenium.clicar_elemento(
-                By.XPATH, '//button[contains(., "Download")]'
-            ):
-                return False
-
-            log.info("  Download em lote iniciado...")
-
-            # Limpa pasta temp antes de aguardar novo ZIP
-            self.file_handler.limpar_temp()
-
-            # Aguarda o ZIP terminar de baixar
-            zip_baixado = self.file_handler.aguardar_download('.zip', timeout=60)
-
-            if not zip_baixado:
-                log.warning("  Timeout aguardando download do ZIP")
-                return False
-
-            log.info(f"  ZIP baixado: {zip_baixado.name}")
-
-            # Processa ZIP
-            qtd = self.file_handler.processar_zip_lote(
-                fundo_nome, self.fundo_manager, report_type,
-                self.datas.data_final
-            )
-
-            if qtd > 0:
-                log.info(f"  {qtd} arquivo(s) processado(s)")
-                return True
-            else:
-                log.warning("  Nenhum arquivo processado do ZIP")
-                return False
+            for caminho, indice in rotas:
+                fundo_info = fundos_urls[indice]
+                arquivo = Path(caminho)
+                data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
+                if not data_arquivo:
+                    data_arquivo = self.datas.data_final
 
-        except Exception as e:
-            log.error(f"  Erro no download em lote: {e}")
-            return False
+                self.file_handler._mover_arquivo(
+                    arquivo, fundo_info['nome'], data_arquivo, report_type,
+                    fundo_info.get('pasta', ''), config=config
+                )
+                log.info(f"  Arquivo movido: {arquivo.name}")
+        finally:
+            shutil.rmtree(extract_dir, ignore_errors=True)
 
 
 # =============================================================================
@@ -2127,12 +2415,17 @@ def carregar_config_planilha(caminho: str) -> Tuple[QorePaths, QoreCredentials,
 
     log.info(f"Lendo configuracoes de: {caminho}")
 
-    wb = openpyxl.load_workbook(caminho, data_only=True)
-    ws = wb['Downloads']
+    # read_only: nao monta o DOM completo nem infla estilos; le apenas a
+    # janela C4:O31 (unica regiao usada) em uma passada
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        cel = _ler_celulas(wb['Downloads'], min_row=4, max_row=31, min_col=3, max_col=15)
+    finally:
+        wb.close()
 
     # Datas
-    data_ini = ws['C4'].value
-    data_fim = ws['C5'].value
+    data_ini = cel.get('C4')
+    data_fim = cel.get('C5')
 
     if isinstance(data_ini, str):
         data_ini = datetime.strptime(data_ini, '%d/%m/%Y')
@@ -2143,30 +2436,31 @@ def carregar_config_planilha(caminho: str) -> Tuple[QorePaths, QoreCredentials,
 
     # Paths
     paths = QorePaths(
-        pdf=str(ws['I9'].value or '').strip(),
-        excel=str(ws['I13'].value or '').strip(),
-        xml=str(ws['I21'].value or r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\XML_QORE').strip(),
+        pdf=str(cel.get('I9') or '').strip(),
+        excel=str(cel.get('I13') or '').strip(),
+        xml=str(cel.get('I21') or r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\XML_QORE').strip(),
         pdf_monitoramento=r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\05. PDF',
-        temp_download=str(ws['I20'].value or '').strip(),
-        bd_path=str(ws['I19'].value or '').strip()
+        temp_download=str(cel.get('I20') or '').strip(),
+        bd_path=str(cel.get('I19') or '').strip()
     )
 
     # Credenciais
     credentials = QoreCredentials(
-        url=str(ws['M10'].value or '').strip(),
-        email=str(ws['N10'].value or '').strip(),
-        senha=str(ws['O10'].value or '').strip()
+        url=str(cel.get('M10') or '').strip(),
+        email=str(cel.get('N10') or '').strip(),
+        senha=str(cel.get('O10') or '').strip()
     )
 
     # Flags
     flags = QoreFlags(
-        qore_enabled=validar_boolean(ws['C24'].value),
-        pdf_enabled=validar_boolean(ws['C25'].value),
-        pdf_lote=validar_boolean(ws['C26'].value),
-        excel_enabled=validar_boolean(ws['C27'].value),
-        excel_lote=validar_boolean(ws['C28'].value),
-        xml_enabled=validar_boolean(ws['C29'].value),
-        xml_lote=validar_boolean(ws['C30'].value)
+        qore_enabled=validar_boolean(cel.get('C24')),
+        pdf_enabled=validar_boolean(cel.get('C25')),
+        pdf_lote=validar_boolean(cel.get('C26')),
+        excel_enabled=validar_boolean(cel.get('C27')),
+        excel_lote=validar_boolean(cel.get('C28')),
+        xml_enabled=validar_boolean(cel.get('C29')),
+        xml_lote=validar_boolean(cel.get('C30')),
+        use_api=validar_boolean(cel.get('C31'))
     )
 
     # Datas
@@ -2175,6 +2469,49 @@ def carregar_config_planilha(caminho: str) -> Tuple[QorePaths, QoreCredentials,
     return paths, credentials, flags, datas
 
 
+# =============================================================================
+# ROTA VIA API HTTP
+# =============================================================================
+
+def executar_via_api(paths: QorePaths, credentials: QoreCredentials,
+                     flags: QoreFlags, datas: QoreDatas) -> QoreFlags:
+    """
+    Executa pela automacao HTTP (automacao_qore_api) os tipos habilitados
+    que a API expoe, sem subir Chrome.
+    Retorna as flags restantes para o Selenium: so os tipos sem endpoint
+    (api_param None) continuam habilitados.
+    """
+    try:
+        import automacao_qore_api as qore_api
+    except ImportError:
+        from core import automacao_qore_api as qore_api
+
+    def converter(origem, destino_cls):
+        nomes = {f.name for f in fields(destino_cls)}
+        return destino_cls(**{f.name: getattr(origem, f.name)
+                              for f in fields(origem) if f.name in nomes})
+
+    sem_api = {tipo for tipo, cfg in qore_api.REPORT_CONFIGS.items() if cfg.api_param is None}
+
+    flags_api = converter(flags, qore_api.QoreFlags)
+    for tipo in sem_api:
+        setattr(flags_api, f'{tipo.lower()}_enabled', False)
+
+    if any([flags_api.pdf_enabled, flags_api.excel_enabled, flags_api.xml_enabled]):
+        qore_api.QoreAutomationAPI(
+            converter(paths, qore_api.QorePaths),
+            converter(credentials, qore_api.QoreCredentials),
+            flags_api,
+            converter(datas, qore_api.QoreDatas)
+        ).executar()
+
+    restantes = converter(flags, QoreFlags)
+    restantes.pdf_enabled = flags.pdf_enabled and 'PDF' in sem_api
+    restantes.excel_enabled = flags.excel_enabled and 'EXCEL' in sem_api
+    restantes.xml_enabled = flags.xml_enabled and 'XML' in sem_api
+    return restantes
+
+
 # =============================================================================
 # MAIN
 # =============================================================================
@@ -2209,6 +2546,13 @@ if __name__ == '__main__':
         if paths.xml:
             os.makedirs(paths.xml, exist_ok=True)
 
+        # C31: tipos servidos pela API nao abrem Chrome
+        if flags.use_api:
+            flags = executar_via_api(paths, credentials, flags, datas)
+            if not any([flags.pdf_enabled, flags.excel_enabled, flags.xml_enabled]):
+                sys.exit(0)
+            log.info("Tipos sem endpoint na API seguem via Selenium")
+
         # Executa
         bot = QoreAutomation(paths, credentials, flags, datas)
         bot.executar()
@@ -83,15 +83,18 @@ import os
 import re
 import sys
 import json
+import base64
 import time
 import shutil
+import functools
 import logging
 import zipfile
+import tempfile
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from enum import Enum
 from urllib.parse import urljoin
 import threading
@@ -99,8 +102,24 @@ import threading
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import pandas as pd
+from urllib3.util.request import ACCEPT_ENCODING
 import openpyxl
+from openpyxl.utils import get_column_letter
+
+# orjson (opcional): decode do JSON da API mais rapido; sem ele, json da
+# stdlib (ambos aceitam bytes, o que evita decodificar o corpo para str)
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# python-calamine (opcional): parser XLSX em Rust para o BD.xlsx.
+# Sem ele a leitura usa openpyxl em streaming (read_only).
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
 
 
 # =============================================================================
@@ -185,9 +204,20 @@ class APIConfig:
     MAX_RETRIES: int = 3
     BACKOFF_FACTOR: float = 0.5
 
+    # Streaming de downloads
+    DOWNLOAD_CHUNK: int = 256 * 1024
+    SPOOL_MAX: int = 16 * 1024 * 1024  # acima disso o spool vai para disco
+
+    # Download em faixas (HTTP Range) de arquivos grandes
+    RANGE_MIN_BYTES: int = 8 * 1024 * 1024
+    RANGE_PARTES: int = 4
+
     # Workers
     NUM_WORKERS: int = 10
 
+    # Renova o JWT este tanto antes do exp (relogio/latencia)
+    TOKEN_REFRESH_MARGIN: int = 60
+
 
 @dataclass
 class ReportConfig:
@@ -282,26 +312,119 @@ class QoreDatas:
 
 def validar_boolean(valor) -> bool:
     """Converte valores da planilha para booleano."""
-    if pd.isna(valor) or valor is None:
+    # Celulas do openpyxl: vazia = None; NaN so em float (valor != valor)
+    if valor is None or (isinstance(valor, float) and valor != valor):
         return False
     valor_str = str(valor).strip().upper()
     return valor_str in {'SIM', 'S', 'TRUE', 'VERDADEIRO', 'YES', 'Y', '1'}
 
 
-def extrair_data_de_nome_arquivo(nome_arquivo: str) -> Optional[datetime]:
-    """Extrai data do nome do arquivo (formato YYYYMMDD)."""
-    matches = re.findall(r'_(\d{8})', nome_arquivo)
-    if not matches:
-        matches = re.findall(r'(\d{8})', nome_arquivo)
+# Data YYYYMMDD no nome do arquivo: grupo 1 = precedida de underscore
+# (mais seguro, evita CNPJ), grupo 2 = qualquer sequencia de 8 digitos
+_RE_DATA_ARQUIVO = re.compile(r'_(\d{8})|(\d{8})')
 
-    for date_str in matches:
-        try:
-            dt = datetime.strptime(date_str, '%Y%m%d')
-            if 2000 <= dt.year <= 2035:
+
+def _converter_data_arquivo(date_str: str) -> Optional[datetime]:
+    """Converte YYYYMMDD em datetime, validando ano razoavel (evita CNPJ)."""
+    try:
+        dt = datetime.strptime(date_str, '%Y%m%d')
+    except ValueError:
+        return None
+    return dt if 2000 <= dt.year <= 2035 else None
+
+
+def extrair_data_de_nome_arquivo(nome_arquivo: str) -> Optional[datetime]:
+    """
+    Extrai data do nome do arquivo (formato YYYYMMDD).
+    Varre o nome uma unica vez: datas com underscore tem prioridade e
+    retornam na primeira valida; sequencias sem underscore so sao usadas
+    como fallback quando nao ha nenhuma com underscore.
+    """
+    tem_underscore = False
+    fallback = None
+
+    for m in _RE_DATA_ARQUIVO.finditer(nome_arquivo):
+        com_underscore = m.group(1)
+        if com_underscore is not None:
+            tem_underscore = True
+            dt = _converter_data_arquivo(com_underscore)
+            if dt:
                 return dt
-        except ValueError:
-            continue
-    return None
+        elif fallback is None and not tem_underscore:
+            fallback = _converter_data_arquivo(m.group(2))
+
+    return None if tem_underscore else fallback
+
+
+def _ler_celulas(ws, min_row: int, max_row: int, min_col: int, max_col: int) -> Dict[str, Any]:
+    """
+    Le uma janela retangular da planilha em uma unica passada.
+    Retorna {coordenada: valor} (ex: {'C4': ...}), adequado para worksheets
+    read_only, que nao suportam acesso aleatorio eficiente por celula.
+    """
+    valores: Dict[str, Any] = {}
+    for num_linha, linha in enumerate(
+        ws.iter_rows(min_row=min_row, max_row=max_row,
+                     min_col=min_col, max_col=max_col, values_only=True),
+        start=min_row
+    ):
+        for num_coluna, valor in enumerate(linha, start=min_col):
+            valores[f"{get_column_letter(num_coluna)}{num_linha}"] = valor
+    return valores
+
+
+def _celula_openpyxl(valor):
+    """
+    Normaliza uma celula do calamine para o que o openpyxl devolveria:
+    vazia ('') vira None e numero inteiro lido como float vira int.
+    """
+    if valor == '':
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _linhas_planilha(caminho: str, aba: str, min_col: int, max_col: int):
+    """
+    Itera as linhas de uma aba como tuplas das colunas min_col..max_col
+    (base 1, como no openpyxl). Usa o python-calamine se instalado; senao
+    openpyxl em streaming (read_only).
+    """
+    if CalamineWorkbook is not None:
+        largura = max_col - min_col + 1
+        # Arquivo aberto (e fechado) aqui: o workbook nao segura o handle do
+        # BD.xlsx (no Windows bloquearia a planilha para quem for edita-la)
+        with open(caminho, 'rb') as fh:
+            wb = CalamineWorkbook.from_filelike(fh)
+            try:
+                # skip_empty_area=False: mantem as colunas/linhas vazias
+                # iniciais, senao os indices deslocam em relacao ao openpyxl
+                linhas = wb.get_sheet_by_name(aba).to_python(skip_empty_area=False)
+            finally:
+                fechar = getattr(wb, 'close', None)
+                if fechar is not None:
+                    fechar()
+        for linha in linhas:
+            valores = tuple(_celula_openpyxl(v) for v in linha[min_col - 1:max_col])
+            yield valores + (None,) * (largura - len(valores))
+        return
+
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        yield from wb[aba].iter_rows(min_col=min_col, max_col=max_col, values_only=True)
+    finally:
+        wb.close()
+
+
+def _expiracao_jwt(token: str) -> Optional[datetime]:
+    """Claim exp do payload do JWT (UTC, sem validar assinatura). None se ausente."""
+    try:
+        payload = token.split('.')[1]
+        dados = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+        return datetime.fromtimestamp(int(dados['exp']), timezone.utc)
+    except Exception:
+        return None
 
 
 def get_versioned_filepath(directory: str, base_name: str, extension: str) -> str:
@@ -311,12 +434,36 @@ def get_versioned_filepath(directory: str, base_name: str, extension: str) -> st
     if not os.path.exists(target):
         return target
 
-    version = 1
+    # Uma leitura do diretorio em vez de um stat por versao existente:
+    # proxima versao = maior "(N)" + 1 (no Windows os nomes nao diferem
+    # por caixa, como o os.path.exists)
+    padrao = re.compile(
+        re.escape(base_name) + r' \((\d+)\)' + re.escape(extension) + '$',
+        re.IGNORECASE if os.name == 'nt' else 0
+    )
+    version = 0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            m = padrao.match(entry.name)
+            if m:
+                version = max(version, int(m.group(1)))
+
+    # Garantia contra nomes equivalentes fora do padrao (ex: "(01)")
     while True:
+        version += 1
         versioned = os.path.join(directory, f"{base_name} ({version}){extension}")
         if not os.path.exists(versioned):
             return versioned
-        version += 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _pasta_carteiras(base_fundos: str, pasta_fundo: str, ano: int, mes: int) -> str:
+    """Pasta de carteiras do fundo: <base>/<fundo>/06. Carteiras/<ano>/<MM - Mes>."""
+    mes_str = f"{mes:02d}"
+    return os.path.join(
+        base_fundos, pasta_fundo, '06. Carteiras',
+        str(ano), f"{mes_str} - {MESES_EXTENSO.get(mes_str, '')}"
+    )
 
 
 # =============================================================================
@@ -334,23 +481,16 @@ class FundoManager:
     def carregar_fundos(self) -> bool:
         """Carrega fundos do arquivo BD.xlsx."""
         try:
-            df = pd.read_excel(
-                self.bd_path,
-                sheet_name='BD',
-                engine='openpyxl',
-                header=None,
-                usecols=[1, 2, 9],
-                dtype=str
-            )
-
-            for _, row in df.iterrows():
-                flag_qore = str(row.iloc[2] or '').strip().upper()
+            # Leitura em streaming, sem montar DataFrame (calamine se instalado).
+            # Colunas B..J -> row[0]=B (apelido), row[1]=C (caminho), row[8]=J (flag)
+            for row in _linhas_planilha(self.bd_path, 'BD', min_col=2, max_col=10):
+                flag_qore = str(row[8] or '').strip().upper()
 
                 if flag_qore in {'SIM', 'S', 'TRUE', 'YES', 'VERDADEIRO', 'QORE'}:
-                    apelido = row.iloc[0]
-                    caminho = row.iloc[1]
+                    apelido = row[0]
+                    caminho = row[1]
 
-                    if pd.notna(apelido) and pd.notna(caminho):
+                    if apelido is not None and caminho is not None:
                         apelido_clean = str(apelido).strip()
                         caminho_clean = str(caminho).strip()
 
@@ -405,10 +545,31 @@ class FundoManager:
 class FileHandler:
     """Gerencia download e movimentacao de arquivos."""
 
+    # Threads de extracao por ZIP
+    EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+    # True = destinos secundarios no mesmo volume viram hardlink do primeiro
+    # (sem copiar bytes). Os nomes compartilham o conteudo: editar um arquivo
+    # no lugar altera o outro. Padrao: copia real
+    HARDLINK_DESTINOS = False
+
     def __init__(self, temp_path: str, paths: QorePaths):
         self.temp_path = temp_path
         self.paths = paths
-        self.lock = threading.Lock()
+        # Um lock por diretorio de destino: versionamento + move de fundos
+        # diferentes correm em paralelo; so o mesmo diretorio serializa
+        self._dir_locks: Dict[str, threading.Lock] = {}
+        self._dir_locks_guard = threading.Lock()
+        # Destinos ja resolvidos por (tipo, ano, mes, pasta do fundo)
+        self._destinos: Dict[Tuple[str, int, int, str], List[str]] = {}
+
+    def _lock_for(self, diretorio: str) -> threading.Lock:
+        """Retorna (criando se preciso) o lock do diretorio de destino."""
+        with self._dir_locks_guard:
+            lock = self._dir_locks.get(diretorio)
+            if lock is None:
+                lock = self._dir_locks[diretorio] = threading.Lock()
+            return lock
 
     def limpar_temp(self):
         """Limpa pasta temporaria de downloads."""
@@ -416,52 +577,100 @@ class FileHandler:
             os.makedirs(self.temp_path, exist_ok=True)
             return
 
-        for item in os.listdir(self.temp_path):
-            item_path = os.path.join(self.temp_path, item)
+        def remover(entry: os.DirEntry):
             try:
-                if os.path.isfile(item_path):
-                    os.unlink(item_path)
-                elif os.path.isdir(item_path):
-                    shutil.rmtree(item_path)
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
             except Exception:
                 pass
 
+        # scandir: DirEntry ja traz o tipo do arquivo (sem stat extra por item).
+        # Remocoes em paralelo: unlink/rmtree esperam metadados do FS, nao CPU
+        with os.scandir(self.temp_path) as entries:
+            itens = list(entries)
+        if itens:
+            with ThreadPoolExecutor(max_workers=min(8, len(itens))) as executor:
+                list(executor.map(remover, itens))
+
     def processar_zip(self, zip_path: Path, fundo_nome: str, fundo_manager: FundoManager,
                      report_type: str, data_referencia: datetime) -> int:
         """Processa arquivo ZIP baixado."""
+        with open(zip_path, 'rb') as f:
+            arquivos_processados = self.processar_zip_stream(
+                f, fundo_nome, fundo_manager, report_type,
+                data_referencia, nome=zip_path.stem
+            )
+
+        zip_path.unlink()
+        return arquivos_processados
+
+    def processar_zip_stream(self, fileobj, fundo_nome: str, fundo_manager: FundoManager,
+                             report_type: str, data_referencia: datetime,
+                             nome: str = 'stream') -> int:
+        """
+        Processa um ZIP a partir de um file object (ex: SpooledTemporaryFile
+        vindo direto do download), sem exigir o ZIP gravado em disco.
+
+        So os membros da raiz com a extensao e o padrao do fundo sao
+        extraidos, em paralelo (o inflate do zlib libera o GIL); cada
+        arquivo e movido assim que sua extracao termina.
+        """
         config = REPORT_CONFIGS.get(report_type.upper())
         if not config:
             return 0
 
-        temp_extract = Path(self.temp_path) / f'extract_{zip_path.stem}'
+        temp_extract = Path(self.temp_path) / f'extract_{nome}'
         temp_extract.mkdir(exist_ok=True)
 
         try:
-            with zipfile.ZipFile(zip_path, 'r') as zf:
-                zf.extractall(temp_extract)
-
-            zip_path.unlink()
-
-            arquivos_processados = 0
-
             if fundo_manager.is_bloko(fundo_nome):
                 padrao = fundo_manager.get_bloko_pattern(fundo_nome)
             else:
                 padrao = fundo_manager.get_sigla(fundo_nome).lower()
+            padrao = padrao.lower()
 
-            for arquivo in temp_extract.glob(f'*{config.extension}'):
-                if padrao and padrao.lower() not in arquivo.name.lower():
-                    continue
-
-                data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
-                if not data_arquivo:
-                    data_arquivo = data_referencia
+            arquivos_processados = 0
 
-                if self._mover_arquivo(
-                    arquivo, fundo_nome, data_arquivo, report_type,
-                    fundo_manager.fundos.get(fundo_nome, '')
-                ):
-                    arquivos_processados += 1
+            with zipfile.ZipFile(fileobj, 'r') as zf:
+                # Filtra pelo diretorio central antes de inflar qualquer byte:
+                # membros de outros fundos nunca sao descompactados
+                membros = [
+                    info for info in zf.infolist()
+                    if not info.is_dir()
+                    and os.path.basename(info.filename) == info.filename
+                    and info.filename.lower().endswith(config.extension)
+                    and (not padrao or padrao in info.filename.lower())
+                ]
+                if not membros:
+                    return 0
+
+                def extrair(info: zipfile.ZipInfo) -> str:
+                    # Stream com buffer de 1 MiB. Sem o saneamento de caminho do
+                    # extract: o filtro so deixa passar nomes simples da raiz
+                    # (basename tambem barra 'C:x.pdf' e contrabarra no Windows)
+                    destino = os.path.join(temp_extract, info.filename)
+                    with zf.open(info) as src, open(destino, 'wb') as out:
+                        shutil.copyfileobj(src, out, 1 << 20)
+                    return destino
+
+                max_workers = min(self.EXTRACT_WORKERS, len(membros))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [executor.submit(extrair, info) for info in membros]
+
+                    for future in as_completed(futures):
+                        arquivo = Path(future.result())
+
+                        data_arquivo = extrair_data_de_nome_arquivo(arquivo.name)
+                        if not data_arquivo:
+                            data_arquivo = data_referencia
+
+                        if self._mover_arquivo(
+                            arquivo, fundo_nome, data_arquivo, report_type,
+                            fundo_manager.fundos.get(fundo_nome, '')
+                        ):
+                            arquivos_processados += 1
 
             return arquivos_processados
 
@@ -488,10 +697,12 @@ class FileHandler:
 
             primeiro_destino = None
 
-            with self.lock:
-                for i, destino_dir in enumerate(destinos):
-                    os.makedirs(destino_dir, exist_ok=True)
+            for i, destino_dir in enumerate(destinos):
+                os.makedirs(destino_dir, exist_ok=True)
 
+                # Escolha do nome versionado e gravacao sob o mesmo lock:
+                # outra thread nao pega o mesmo "(N)" no diretorio
+                with self._lock_for(destino_dir):
                     caminho_final = get_versioned_filepath(
                         destino_dir, nome_base, config.extension
                     )
@@ -499,10 +710,11 @@ class FileHandler:
                     if i == 0:
                         shutil.move(str(arquivo), caminho_final)
                         primeiro_destino = caminho_final
-                        log.info(f"  {report_type} -> {Path(caminho_final).name}")
-                    else:
-                        if primeiro_destino and os.path.exists(primeiro_destino):
-                            shutil.copy(primeiro_destino, caminho_final)
+                    elif primeiro_destino and os.path.exists(primeiro_destino):
+                        self._copiar_destino(primeiro_destino, caminho_final)
+
+                if i == 0:
+                    log.info(f"  {report_type} -> {Path(caminho_final).name}")
 
             return True
 
@@ -510,32 +722,49 @@ class FileHandler:
             log.error(f"Falha ao mover arquivo: {e}")
             return False
 
+    def _copiar_destino(self, origem: str, destino: str):
+        """Hardlink quando permitido e no mesmo volume; senao copia."""
+        if self.HARDLINK_DESTINOS:
+            try:
+                os.link(origem, destino)
+                return
+            except OSError:
+                pass  # EXDEV (outro volume), FS sem suporte, permissao
+        shutil.copy(origem, destino)
+
     def _get_destinos(self, report_type: str, data: datetime, pasta_fundo: str) -> List[str]:
-        """Retorna lista de diretorios de destino."""
+        """
+        Retorna lista de diretorios de destino.
+        Resolvida uma vez por (tipo, ano, mes, fundo); os demais arquivos do
+        mesmo fundo reaproveitam.
+        """
+        tipo = report_type.upper()
+        chave = (tipo, data.year, data.month, pasta_fundo)
+        destinos = self._destinos.get(chave)
+        if destinos is not None:
+            return destinos
+
         destinos = []
-        ano = data.strftime('%Y')
-        mes = data.strftime('%m')
 
-        if report_type.upper() == 'PDF':
+        if tipo == 'PDF':
             if pasta_fundo:
-                mes_formatado = f"{mes} - {MESES_EXTENSO.get(mes, '')}"
-                path_fundo = os.path.join(
-                    self.paths.base_fundos, pasta_fundo,
-                    '06. Carteiras', ano, mes_formatado
-                )
-                destinos.append(path_fundo)
+                destinos.append(_pasta_carteiras(
+                    self.paths.base_fundos, pasta_fundo, data.year, data.month
+                ))
 
             if self.paths.pdf_monitoramento:
                 destinos.append(self.paths.pdf_monitoramento)
 
-        elif report_type.upper() == 'EXCEL':
+        elif tipo == 'EXCEL':
             if self.paths.excel:
                 destinos.append(self.paths.excel)
 
-        elif report_type.upper() == 'XML':
+        elif tipo == 'XML':
             if self.paths.xml:
                 destinos.append(self.paths.xml)
 
+        # Threads concorrentes no maximo recalculam a mesma lista
+        self._destinos[chave] = destinos
         return destinos
 
 
@@ -551,10 +780,18 @@ class QoreAPIClient:
         self.config = APIConfig()
         self.token: Optional[str] = None
         self.token_expiry: Optional[datetime] = None
+        # Uma unica (re)autenticacao por vez entre as threads de download
+        self._auth_lock = threading.Lock()
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
-        """Cria sessao HTTP com retry automatico."""
+        """
+        Cria sessao HTTP com retry automatico.
+        Uma unica sessao por cliente, compartilhada por todas as threads do
+        QoreDownloadManager: o pool do adapter comporta NUM_WORKERS conexoes
+        keep-alive simultaneas, entao o handshake TLS e pago uma vez por
+        conexao e nao por arquivo.
+        """
         session = requests.Session()
 
         retry_strategy = Retry(
@@ -564,7 +801,13 @@ class QoreAPIClient:
             allowed_methods=["HEAD", "GET", "POST", "OPTIONS"]
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Sem pool_maxsize >= NUM_WORKERS o urllib3 descarta conexoes
+        # excedentes e os workers voltam a abrir TCP+TLS a cada download
+        adapter = HTTPAdapter(
+            pool_connections=self.config.NUM_WORKERS,
+            pool_maxsize=self.config.NUM_WORKERS * 2,
+            max_retries=retry_strategy
+        )
         session.mount("https://", adapter)
         session.mount("http://", adapter)
 
@@ -572,7 +815,12 @@ class QoreAPIClient:
         session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json, text/plain, */*',
-            'Content-Type': 'application/json'
+            'Content-Type': 'application/json',
+            'Connection': 'keep-alive',
+            # Tudo que o urllib3 sabe decodificar: gzip/deflate e tambem br
+            # (e zstd no urllib3 2) quando brotli/zstandard estao instalados.
+            # O JSON das listagens encolhe bem
+            'Accept-Encoding': ACCEPT_ENCODING
         })
 
         return session
@@ -596,11 +844,21 @@ class QoreAPIClient:
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 self.token = data.get('access_token') or data.get('token') or data.get('accessToken')
 
                 if self.token:
                     self.session.headers['Authorization'] = f'Bearer {self.token}'
+                    expiracao = _expiracao_jwt(self.token)
+                    if expiracao:
+                        # Margem limitada a metade da validade: token curto nao
+                        # nasce "vencido" (reautenticaria a cada chamada)
+                        validade = expiracao - datetime.now(timezone.utc)
+                        margem = min(timedelta(seconds=self.config.TOKEN_REFRESH_MARGIN),
+                                     validade / 2)
+                        self.token_expiry = expiracao - margem
+                    else:
+                        self.token_expiry = None
                     log.info("Autenticacao OK!")
                     return True
                 else:
@@ -614,6 +872,46 @@ class QoreAPIClient:
             log.error(f"Erro na autenticacao: {e}")
             return False
 
+    def ensure_token(self) -> bool:
+        """
+        Garante token valido sem reautenticar a cada chamada: so faz o POST
+        se nao ha token ou se o exp do JWT (menos a margem) ja passou.
+        Token sem exp vale ate a API responder 401 (ver _enviar).
+        """
+        if self._token_valido():
+            return True
+        with self._auth_lock:
+            # Outra thread pode ter renovado enquanto esperavamos o lock
+            if self._token_valido():
+                return True
+            return self.authenticate()
+
+    def _token_valido(self) -> bool:
+        """Token presente e dentro da validade conhecida."""
+        return bool(self.token) and (
+            self.token_expiry is None or datetime.now(timezone.utc) < self.token_expiry
+        )
+
+    def _renovar_token(self, token_usado: Optional[str]) -> bool:
+        """Reautentica apos 401, uma vez so, mesmo com varias threads recusadas."""
+        with self._auth_lock:
+            if self.token != token_usado and self._token_valido():
+                return True  # outra thread ja renovou
+            self.token = None
+            return self.authenticate()
+
+    def _enviar(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Requisicao autenticada: garante o token e refaz uma vez apos 401."""
+        self.ensure_token()
+        token_usado = self.token
+        response = self.session.request(method, url, **kwargs)
+        if response.status_code == 401:
+            response.close()
+            log.info("Token recusado (401), reautenticando...")
+            self._renovar_token(token_usado)
+            response = self.session.request(method, url, **kwargs)
+        return response
+
     def get_fund_files(self, uuid: str, file_type: str, page: int = 0) -> List[Dict]:
         """Lista arquivos de um fundo."""
         try:
@@ -632,14 +930,15 @@ class QoreAPIClient:
                 'p': page
             }
 
-            response = self.session.get(
+            response = self._enviar(
+                'GET',
                 url,
                 params=params,
                 timeout=(self.config.CONNECT_TIMEOUT, self.config.READ_TIMEOUT)
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
                 # A API retorna resposta paginada com 'content'
                 if isinstance(data, dict):
                     return data.get('content', data.get('items', data.get('data', [])))
@@ -657,39 +956,155 @@ class QoreAPIClient:
     def download_file_by_guid(self, fundo_uuid: str, arquivo_guid: str, dest_path: Path) -> bool:
         """Baixa um arquivo pelo GUID."""
         try:
-            endpoint = self.config.DOWNLOAD_ENDPOINT.format(
-                fundo_uuid=fundo_uuid,
-                arquivo_guid=arquivo_guid
-            )
-            url = urljoin(self.config.BASE_URL, endpoint)
+            url = self._url_download(fundo_uuid, arquivo_guid)
 
-            response = self.session.get(
-                url,
-                timeout=(self.config.CONNECT_TIMEOUT, 120),
-                stream=True
-            )
+            response = self._abrir_download(url)
+            if response is None:
+                return False
 
-            if response.status_code == 200:
-                dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-                with open(dest_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-                return True
-            else:
-                log.warning(f"Falha no download: {response.status_code}")
-                return False
+            # Buffer de 1 MiB: varios chunks por write() no disco
+            with open(dest_path, 'wb', buffering=1 << 20) as f:
+                self._gravar_download(url, response, f)
+            return True
 
         except Exception as e:
             log.error(f"Erro no download: {e}")
             return False
 
+    def download_file_stream(self, fundo_uuid: str, arquivo_guid: str):
+        """
+        Baixa um arquivo pelo GUID para um SpooledTemporaryFile.
+        Fica em memoria ate SPOOL_MAX e vai para disco acima disso; volta
+        posicionado no inicio. Retorna None em caso de falha. O chamador
+        fecha o arquivo.
+        """
+        try:
+            url = self._url_download(fundo_uuid, arquivo_guid)
+
+            response = self._abrir_download(url)
+            if response is None:
+                return None
+
+            spool = tempfile.SpooledTemporaryFile(max_size=self.config.SPOOL_MAX)
+            try:
+                self._gravar_download(url, response, spool)
+            except Exception:
+                spool.close()
+                raise
+
+            spool.seek(0)
+            return spool
+
+        except Exception as e:
+            log.error(f"Erro no download: {e}")
+            return None
+
+    def _url_download(self, fundo_uuid: str, arquivo_guid: str) -> str:
+        """URL absoluta do download de um arquivo."""
+        endpoint = self.config.DOWNLOAD_ENDPOINT.format(
+            fundo_uuid=fundo_uuid,
+            arquivo_guid=arquivo_guid
+        )
+        return urljoin(self.config.BASE_URL, endpoint)
+
+    def _abrir_download(self, url: str, headers: Optional[Dict[str, str]] = None,
+                        status: int = 200) -> Optional[requests.Response]:
+        """GET em stream; None (resposta fechada) se o status nao for o esperado."""
+        response = self._enviar(
+            'GET',
+            url,
+            headers=headers,
+            timeout=(self.config.CONNECT_TIMEOUT, 120),
+            stream=True
+        )
+        if response.status_code != status:
+            if status == 200:
+                log.warning(f"Falha no download: {response.status_code}")
+            response.close()
+            return None
+        return response
+
+    def _gravar_download(self, url: str, response: requests.Response, destino):
+        """
+        Grava a resposta em `destino` (file object no inicio).
+        Arquivo grande com Accept-Ranges e sem compressao vai em RANGE_PARTES
+        faixas paralelas (a resposta ja aberta vira a primeira); se alguma
+        faixa falhar, refaz em stream unico.
+        """
+        with response:
+            total = int(response.headers.get('Content-Length') or 0)
+            em_faixas = (
+                total >= self.config.RANGE_MIN_BYTES
+                and 'bytes' in response.headers.get('Accept-Ranges', '').lower()
+                and response.headers.get('Content-Encoding', 'identity').lower() == 'identity'
+            )
+
+            if em_faixas:
+                try:
+                    self._gravar_faixas(url, response, total, destino)
+                    return
+                except Exception as e:
+                    log.debug(f"Download em faixas falhou, refazendo em stream unico: {e}")
+                destino.seek(0)
+                destino.truncate()
+                response = self._abrir_download(url)
+                if response is None:
+                    raise IOError("download refeito falhou")
+
+            with response:
+                for chunk in response.iter_content(chunk_size=self.config.DOWNLOAD_CHUNK):
+                    if chunk:
+                        destino.write(chunk)
+
+    def _gravar_faixas(self, url: str, primeira: requests.Response, total: int, destino):
+        """
+        Baixa [0, total) em faixas paralelas e grava cada uma no seu offset.
+        seek+write sob lock (sem os.pwrite: precisa rodar no Windows e em
+        SpooledTemporaryFile); o gargalo e a rede, nao a escrita.
+        """
+        tamanho = -(-total // self.config.RANGE_PARTES)
+        faixas = [(inicio, min(inicio + tamanho, total) - 1)
+                  for inicio in range(0, total, tamanho)]
+        lock = threading.Lock()
+
+        def baixar(inicio: int, fim: int, response: Optional[requests.Response]):
+            if response is None:
+                response = self._abrir_download(
+                    url, headers={'Range': f'bytes={inicio}-{fim}'}, status=206
+                )
+                if response is None:
+                    raise IOError(f"faixa {inicio}-{fim} recusada")
+
+            posicao = inicio
+            with response:
+                for chunk in response.iter_content(chunk_size=self.config.DOWNLOAD_CHUNK):
+                    # A primeira resposta traz o arquivo inteiro: corta no fim da faixa
+                    chunk = chunk[:fim + 1 - posicao]
+                    with lock:
+                        destino.seek(posicao)
+                        destino.write(chunk)
+                    posicao += len(chunk)
+                    if posicao > fim:
+                        break
+
+            if posicao <= fim:
+                raise IOError(f"faixa {inicio}-{fim} incompleta")
+
+        with ThreadPoolExecutor(max_workers=len(faixas)) as executor:
+            futures = [
+                executor.submit(baixar, inicio, fim, primeira if i == 0 else None)
+                for i, (inicio, fim) in enumerate(faixas)
+            ]
+            for future in futures:
+                future.result()
+
     def _request(self, method: str, endpoint: str, **kwargs) -> requests.Response:
         """Wrapper para requisicoes com tratamento de erros."""
         url = urljoin(self.config.BASE_URL, endpoint)
 
-        response = self.session.request(
+        response = self._enviar(
             method,
             url,
             timeout=(self.config.CONNECT_TIMEOUT, self.config.READ_TIMEOUT),
@@ -761,7 +1176,9 @@ class QoreDownloadManager:
     def download_all_funds(self, file_types: List[str]) -> Dict[str, Dict]:
         """
         Baixa arquivos de todos os fundos em paralelo.
-        Processa todos os tipos de arquivo simultaneamente.
+        Listagem e download dividem o mesmo pool: cada arquivo listado vira
+        uma tarefa propria assim que a listagem do seu fundo/tipo termina,
+        sem esperar os demais fundos nem os outros arquivos do mesmo fundo.
         """
         resultados = {}
 
@@ -792,105 +1209,149 @@ class QoreDownloadManager:
 
         log.info(f"Iniciando {len(tasks)} downloads em paralelo ({self.config.NUM_WORKERS} workers)...")
 
+        # Downloads ainda em voo por fundo/tipo
+        pendentes: Dict[str, int] = {}
+
         # Executa em paralelo
         with ThreadPoolExecutor(max_workers=self.config.NUM_WORKERS) as executor:
             futures = {
-                executor.submit(self._download_fund_files, task): task
+                executor.submit(self._listar_arquivos_fundo, task): ('listar', task)
                 for task in tasks
             }
 
-            for future in as_completed(futures):
-                task = futures[future]
-                try:
-                    result = future.result()
-                    key = f"{task['nome']}_{task['tipo']}"
-                    resultados[key] = result
-                except Exception as e:
-                    log.error(f"Worker falhou para {task['nome']}: {e}")
+            while futures:
+                concluidos, _ = wait(futures, return_when=FIRST_COMPLETED)
+
+                for future in concluidos:
+                    etapa, task = futures.pop(future)
                     key = f"{task['nome']}_{task['tipo']}"
-                    resultados[key] = {'status': 'erro', 'motivo': str(e)}
+                    resultado = resultados.setdefault(key, {
+                        'nome': task['nome'],
+                        'tipo': task['tipo'],
+                        'status': 'erro',
+                        'arquivos': 0
+                    })
+
+                    try:
+                        retorno = future.result()
+                    except Exception as e:
+                        log.error(f"Worker falhou para {task['nome']}: {e}")
+                        resultado['motivo'] = str(e)
+                        retorno = None if etapa == 'listar' else False
+
+                    if etapa == 'listar':
+                        if retorno is None:
+                            continue
+                        pendentes[key] = len(retorno)
+                        for arquivo_guid, nome_arquivo, data_ref in retorno:
+                            futures[executor.submit(
+                                self._baixar_arquivo_fundo, task,
+                                arquivo_guid, nome_arquivo, data_ref
+                            )] = ('baixar', task)
+                    else:
+                        pendentes[key] -= 1
+                        if retorno:
+                            resultado['arquivos'] += 1
+
+                    if pendentes[key] == 0:
+                        self._finalizar_tarefa(task, resultado)
 
         return resultados
 
-    def _download_fund_files(self, task: Dict) -> Dict:
-        """Processa download de um fundo/tipo."""
+    def _listar_arquivos_fundo(self, task: Dict) -> Optional[List[Tuple[str, str, datetime]]]:
+        """
+        Lista os arquivos de um fundo/tipo dentro do periodo.
+        Retorna [(guid, nome_arquivo, data_ref)] ou None se a API nao
+        devolveu nenhum arquivo.
+        """
         nome = task['nome']
         uuid = task['uuid']
-        pasta = task['pasta']
         tipo = task['tipo']
 
-        resultado = {
-            'nome': nome,
-            'tipo': tipo,
-            'status': 'erro',
-            'arquivos': 0
-        }
+        # Lista arquivos do fundo
+        arquivos = self.api.get_fund_files(uuid, tipo)
 
-        try:
-            # Cria pasta temporaria para este fundo
-            temp_fundo = Path(self.file_handler.temp_path) / f'{uuid}_{tipo}'
-            temp_fundo.mkdir(parents=True, exist_ok=True)
-
-            # Lista arquivos do fundo
-            arquivos = self.api.get_fund_files(uuid, tipo)
+        if not arquivos:
+            log.warning(f"  {nome} [{tipo}]: Nenhum arquivo encontrado")
+            return None
 
-            if not arquivos:
-                log.warning(f"  {nome} [{tipo}]: Nenhum arquivo encontrado")
-                return resultado
+        selecionados = []
 
-            qtd_baixados = 0
+        for arq in arquivos:
+            # Filtra por data
+            data_arq_str = arq.get('data') or arq.get('dataReferencia')
+            data_arq = None
 
-            for arq in arquivos:
-                # Filtra por data
-                data_arq_str = arq.get('data') or arq.get('dataReferencia')
-                data_arq = None
-
-                if data_arq_str:
-                    try:
-                        if isinstance(data_arq_str, str):
-                            data_arq = datetime.strptime(data_arq_str[:10], '%Y-%m-%d')
-                        else:
-                            data_arq = data_arq_str
+            if data_arq_str:
+                try:
+                    if isinstance(data_arq_str, str):
+                        data_arq = datetime.strptime(data_arq_str[:10], '%Y-%m-%d')
+                    else:
+                        data_arq = data_arq_str
+
+                    if not (self.datas.data_inicial.date() <= data_arq.date() <= self.datas.data_final.date()):
+                        continue
+                except Exception:
+                    pass
+
+            # Obtem GUID do arquivo
+            arquivo_guid = arq.get('guid') or arq.get('id')
+            if not arquivo_guid:
+                continue
+
+            # Nome do arquivo (guid no fallback: downloads do mesmo fundo/tipo
+            # rodam em paralelo e nao podem colidir na pasta temporaria)
+            nome_arquivo = arq.get('nome') or arq.get('nomeArquivo') or f'{uuid}_{tipo}_{arquivo_guid}'
+            data_ref = data_arq if data_arq else self.datas.data_inicial
+
+            selecionados.append((arquivo_guid, nome_arquivo, data_ref))
+
+        return selecionados
+
+    def _baixar_arquivo_fundo(self, task: Dict, arquivo_guid: str,
+                              nome_arquivo: str, data_ref: datetime) -> bool:
+        """Baixa um arquivo e move para o destino final."""
+        # Lotes chegam como ZIP: extrai direto do stream, sem gravar o ZIP
+        if nome_arquivo.lower().endswith('.zip'):
+            spool = self.api.download_file_stream(task['uuid'], arquivo_guid)
+            if spool is None:
+                return False
+            with spool:
+                return self.file_handler.processar_zip_stream(
+                    spool, task['nome'], self.fundo_manager, task['tipo'],
+                    data_ref, nome=f"{task['uuid']}_{arquivo_guid}"
+                ) > 0
+
+        # Subpasta por GUID: arquivos do mesmo fundo baixam em paralelo e
+        # podem repetir o nome (o fallback de nome, por exemplo)
+        dest_file = (Path(self.file_handler.temp_path) / f"{task['uuid']}_{task['tipo']}"
+                     / arquivo_guid / nome_arquivo)
+
+        # Baixa arquivo usando o endpoint correto
+        if not self.api.download_file_by_guid(task['uuid'], arquivo_guid, dest_file):
+            return False
 
-                        if not (self.datas.data_inicial.date() <= data_arq.date() <= self.datas.data_final.date()):
-                            continue
-                    except Exception:
-                        pass
-
-                # Obtem GUID do arquivo
-                arquivo_guid = arq.get('guid') or arq.get('id')
-                if not arquivo_guid:
-                    continue
-
-                # Nome do arquivo
-                nome_arquivo = arq.get('nome') or arq.get('nomeArquivo') or f'{uuid}_{tipo}'
-                dest_file = temp_fundo / nome_arquivo
-
-                # Baixa arquivo usando o endpoint correto
-                if self.api.download_file_by_guid(uuid, arquivo_guid, dest_file):
-                    # Move para destino final
-                    data_ref = data_arq if data_arq else self.datas.data_inicial
-                    if self.file_handler.processar_arquivo_individual(
-                        dest_file, nome, data_ref, tipo, pasta
-                    ):
-                        qtd_baixados += 1
-
-            if qtd_baixados > 0:
-                resultado['status'] = 'sucesso'
-                resultado['arquivos'] = qtd_baixados
-                log.info(f"  {nome} [{tipo}]: {qtd_baixados} arquivo(s)")
-            else:
-                log.warning(f"  {nome} [{tipo}]: Nenhum arquivo no periodo")
+        # Move para destino final
+        return self.file_handler.processar_arquivo_individual(
+            dest_file, task['nome'], data_ref, task['tipo'], task['pasta']
+        )
 
-            # Limpa pasta temporaria
-            if temp_fundo.exists():
-                shutil.rmtree(temp_fundo, ignore_errors=True)
+    def _finalizar_tarefa(self, task: Dict, resultado: Dict):
+        """Fecha um fundo/tipo apos o ultimo download: status, log e limpeza."""
+        nome = task['nome']
+        tipo = task['tipo']
+        qtd_baixados = resultado['arquivos']
 
-        except Exception as e:
-            log.error(f"  {nome} [{tipo}]: Erro - {e}")
-            resultado['motivo'] = str(e)
+        if qtd_baixados > 0:
+            resultado['status'] = 'sucesso'
+            log.info(f"  {nome} [{tipo}]: {qtd_baixados} arquivo(s)")
+        else:
+            log.warning(f"  {nome} [{tipo}]: Nenhum arquivo no periodo")
 
-        return resultado
+        # Limpa pasta temporaria
+        temp_fundo = Path(self.file_handler.temp_path) / f"{task['uuid']}_{tipo}"
+        if temp_fundo.exists():
+            shutil.rmtree(temp_fundo, ignore_errors=True)
 
 
 # =============================================================================
@@ -929,7 +1390,7 @@ class QoreAutomationAPI:
             return
 
         # Autentica na API
-        if not self.api_client.authenticate():
+        if not self.api_client.ensure_token():
             log.critical("Falha na autenticacao. Abortando.")
             return
 
@@ -1017,12 +1478,17 @@ def carregar_config_planilha(caminho: str) -> Tuple[QorePaths, QoreCredentials,
 
     log.info(f"Lendo configuracoes de: {caminho}")
 
-    wb = openpyxl.load_workbook(caminho, data_only=True)
-    ws = wb['Downloads']
+    # read_only: nao monta o DOM completo nem infla estilos; le apenas a
+    # janela C4:O30 (unica regiao usada) em uma passada
+    wb = openpyxl.load_workbook(caminho, read_only=True, data_only=True, keep_links=False)
+    try:
+        cel = _ler_celulas(wb['Downloads'], min_row=4, max_row=30, min_col=3, max_col=15)
+    finally:
+        wb.close()
 
     # Datas
-    data_ini = ws['C4'].value
-    data_fim = ws['C5'].value
+    data_ini = cel.get('C4')
+    data_fim = cel.get('C5')
 
     if isinstance(data_ini, str):
         data_ini = datetime.strptime(data_ini, '%d/%m/%Y')
@@ -1033,30 +1499,30 @@ def carregar_config_planilha(caminho: str) -> Tuple[QorePaths, QoreCredentials,
 
     # Paths
     paths = QorePaths(
-        pdf=str(ws['I9'].value or '').strip(),
-        excel=str(ws['I13'].value or '').strip(),
-        xml=str(ws['I21'].value or r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\XML_QORE').strip(),
+        pdf=str(cel.get('I9') or '').strip(),
+        excel=str(cel.get('I13') or '').strip(),
+        xml=str(cel.get('I21') or r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\XML_QORE').strip(),
         pdf_monitoramento=r'C:\bloko\Fundos - Documentos\00. Monitoramento\01. Rotinas\03. Arquivos Rotina\05. PDF',
-        temp_download=str(ws['I20'].value or '').strip(),
-        bd_path=str(ws['I19'].value or '').strip()
+        temp_download=str(cel.get('I20') or '').strip(),
+        bd_path=str(cel.get('I19') or '').strip()
     )
 
     # Credenciais
     credentials = QoreCredentials(
-        url=str(ws['M10'].value or '').strip(),
-        email=str(ws['N10'].value or '').strip(),
-        senha=str(ws['O10'].value or '').strip()
+        url=str(cel.get('M10') or '').strip(),
+        email=str(cel.get('N10') or '').strip(),
+        senha=str(cel.get('O10') or '').strip()
     )
 
     # Flags
     flags = QoreFlags(
-        qore_enabled=validar_boolean(ws['C24'].value),
-        pdf_enabled=validar_boolean(ws['C25'].value),
-        pdf_lote=validar_boolean(ws['C26'].value),
-        excel_enabled=validar_boolean(ws['C27'].value),
-        excel_lote=validar_boolean(ws['C28'].value),
-        xml_enabled=validar_boolean(ws['C29'].value),
-        xml_lote=validar_boolean(ws['C30'].value)
+        qore_enabled=validar_boolean(cel.get('C24')),
+        pdf_enabled=validar_boolean(cel.get('C25')),
+        pdf_lote=validar_boolean(cel.get('C26')),
+        excel_enabled=validar_boolean(cel.get('C27')),
+        excel_lote=validar_boolean(cel.get('C28')),
+        xml_enabled=validar_boolean(cel.get('C29')),
+        xml_lote=validar_boolean(cel.get('C30'))
     )
 
     # Datas
@@ -227,6 +227,21 @@ class QoreDownloader:
             log.error(f"Falha no login: {e}")
             return False
 
+    # Procura a linha da data (2a coluna) e clica no botão da 4a coluna, tudo
+    # no navegador: um round-trip em vez de um por linha/célula
+    _JS_CLICAR_DATA = """
+        var linhas = document.querySelectorAll('table tbody tr');
+        for (var i = 0; i < linhas.length; i++) {
+            var colunas = linhas[i].querySelectorAll('td');
+            if (colunas.length < 4 || colunas[1].innerText.trim() !== arguments[0]) continue;
+            var botao = colunas[3].querySelector('button');
+            if (!botao) return false;
+            botao.click();
+            return true;
+        }
+        return false;
+    """
+
     def download_xml_for_fund(self, fund_name: str, sigla: str, target_date: date) -> Optional[str]:
         """
         Baixa o XML de um fundo para uma data específica.
@@ -259,18 +274,13 @@ class QoreDownloader:
             ).click()
             time.sleep(2)
 
-            # Busca a data na tabela
-            linhas = self.driver.find_elements(By.XPATH, '//table/tbody/tr')
-            for linha in linhas:
-                colunas = linha.find_elements(By.TAG_NAME, 'td')
-                if len(colunas) >= 3 and colunas[1].text.strip() == data_formatada:
-                    botao = colunas[3].find_element(By.TAG_NAME, 'button')
-                    botao.click()
-                    log.info(f"Baixando XML: {fund_name} - {data_formatada}")
-                    time.sleep(3)
-
-                    # Move o arquivo para pasta final
-                    return self._move_downloaded_file(fund_name, target_date)
+            # Busca a data na tabela e clica no download
+            if self.driver.execute_script(self._JS_CLICAR_DATA, data_formatada):
+                log.info(f"Baixando XML: {fund_name} - {data_formatada}")
+                time.sleep(3)
+
+                # Move o arquivo para pasta final
+                return self._move_downloaded_file(fund_name, target_date)
 
             log.warning(f"Data {data_formatada} não encontrada para {fund_name}")
             return None
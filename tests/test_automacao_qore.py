@@ -0,0 +1,108 @@
+"""
+Testes das regras puras da automacao QORE (core/automacao_qore.py).
+Requer as dependencias do modulo (selenium, openpyxl); sem elas, pula.
+"""
+import os
+import re
+import sys
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip('openpyxl')
+pytest.importorskip('selenium')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'core'))
+
+import automacao_qore as qore  # noqa: E402
+
+
+# =============================================================================
+# Roteamento de arquivos do ZIP para fundos (_mapa_padroes/_fundo_do_arquivo)
+# =============================================================================
+
+def _fundo(nome_lower, *padroes):
+    """Indice do fundo dono de `nome_lower`, fundos na ordem de `padroes`."""
+    fundos_urls = [{'padrao_lower': p} for p in padroes]
+    re_padroes, mapa_padroes = qore.QoreAutomation._mapa_padroes(None, fundos_urls)
+    return qore._fundo_do_arquivo(nome_lower, re_padroes, mapa_padroes)
+
+
+def test_sigla_curta_antes_no_nome_nao_rouba_o_arquivo():
+    # 'al' aparece antes no nome, mas 'alpha' vem antes na lista de fundos
+    assert _fundo('al_alpha_20240131.pdf', 'alpha', 'al') == 0
+
+
+def test_padroes_sobrepostos_na_mesma_posicao():
+    assert _fundo('carteira_abc_20240131.pdf', 'ab', 'abc') == 0
+    assert _fundo('carteira_abc_20240131.pdf', 'abc', 'ab') == 0
+
+
+def test_padrao_contido_em_outro_vence_o_primeiro_da_lista():
+    # 'bloko fim' contem 'fim': vence quem vier primeiro, como no loop original
+    assert _fundo('fidc bloko fim_20240131.pdf', 'fim', 'bloko fim') == 0
+    assert _fundo('fidc bloko fim_20240131.pdf', 'bloko fim', 'fim') == 0
+
+
+def test_padrao_repetido_fica_com_o_primeiro_fundo():
+    assert _fundo('xyz_20240131.pdf', 'outro', 'xyz', 'xyz') == 1
+
+
+def test_nome_sem_padrao_conhecido():
+    assert _fundo('desconhecido_20240131.pdf', 'alpha', 'beta') is None
+
+
+def test_sem_padroes():
+    assert qore.QoreAutomation._mapa_padroes(None, [{'padrao_lower': ''}]) is None
+
+
+# =============================================================================
+# Data no nome do arquivo (extrair_data_de_nome_arquivo)
+# =============================================================================
+
+def _extrair_data_original(nome_arquivo):
+    """Implementacao original (dois findall), referencia do comportamento."""
+    matches = re.findall(r'_(\d{8})', nome_arquivo)
+    if not matches:
+        matches = re.findall(r'(\d{8})', nome_arquivo)
+    for date_str in matches:
+        try:
+            dt = datetime.strptime(date_str, '%Y%m%d')
+            if 2000 <= dt.year <= 2035:
+                return dt
+        except ValueError:
+            continue
+    return None
+
+
+NOMES_DATA = [
+    # (nome, data esperada)
+    ('Carteira_FIDC ABC_20240131.pdf', datetime(2024, 1, 31)),
+    # CNPJ antes da data: os 8 primeiros digitos do CNPJ nao viram data
+    ('12345678000190_20240131.pdf', datetime(2024, 1, 31)),
+    ('Carteira 12345678000190.pdf', None),
+    # Data com underscore invalida: tenta a proxima com underscore
+    ('rel_99999999_20240229.xml', datetime(2024, 2, 29)),
+    ('rel_20241399_20240301.xml', datetime(2024, 3, 1)),
+    # Ha underscore (todas invalidas): digitos soltos nao servem de fallback
+    ('20240131 rel_99999999.pdf', None),
+    ('20240131_x_19991231.pdf', None),
+    # So digitos soltos: primeira sequencia valida
+    ('Carteira 20240131.pdf', datetime(2024, 1, 31)),
+    ('Carteira 19990101 20240131.pdf', datetime(2024, 1, 31)),
+    ('1234567820240131.pdf', datetime(2024, 1, 31)),
+    ('sem data.pdf', None),
+]
+
+
+@pytest.mark.parametrize('nome,esperado', NOMES_DATA)
+def test_extrair_data_de_nome_arquivo(nome, esperado):
+    assert qore.extrair_data_de_nome_arquivo(nome) == esperado
+    assert _extrair_data_original(nome) == esperado
+
+
+@pytest.mark.parametrize('nome,esperado', NOMES_DATA)
+def test_extrair_data_de_nome_arquivo_api(nome, esperado):
+    pytest.importorskip('requests')
+    import automacao_qore_api as qore_api
+    assert qore_api.extrair_data_de_nome_arquivo(nome) == esperado